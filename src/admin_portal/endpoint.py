@@ -1,28 +1,126 @@
-from fastapi import FastAPI, HTTPException, Depends, status
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Depends, Path, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, EmailStr
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, EmailStr
 from typing import Optional, List
 from datetime import datetime, timedelta
-from pymongo import MongoClient
+from pymongo import AsyncMongoClient
+from pymongo.errors import BulkWriteError, OperationFailure, PyMongoError
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import base64
+import functools
 import bcrypt
 import hashlib
 import jwt
-from bson import ObjectId
+import orjson
+import re
+import time
+from bson import Decimal128, ObjectId, json_util
+from bson.errors import InvalidId
+from cachetools import TTLCache
+from loguru import logger
 import os
 
 # Configuration
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-this")  # Change in production!
 ALGORITHM = "HS256"
+SIGNING_KEY = SECRET_KEY.encode('utf-8')  # Encoded once, not per token
+ALGORITHMS = [ALGORITHM]
 ACCESS_TOKEN_EXPIRE_MINUTES = 1440  # 24 hours
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))  # Lower (min 4) only for dev/tests
 MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017/")
 DATABASE_NAME = os.getenv("DATABASE_NAME", "bookclub_db")
+STATS_CACHE_TTL_SECONDS = 5
+AUTH_CACHE_TTL_SECONDS = 30
+# ETL bookkeeping fields (load_mongo's content hash) never returned to clients
+HIDDEN_FIELDS = {"content_hash": 0}
+USER_PROJECTION = {"password": 0, **HIDDEN_FIELDS}
+MONGODB_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "20"))  # Per worker process
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))  # Processes for bulk bcrypt
+MAX_BULK_USERS = 500  # Largest batch accepted by /api/users/bulk
+
+def orjson_default(obj):
+    """Serialize BSON types that orjson does not handle natively"""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, bytes):  # Includes bson.Binary, e.g. encrypted PII
+        try:
+            return obj.decode('utf-8')
+        except UnicodeDecodeError:
+            return base64.b64encode(obj).decode('ascii')
+    if isinstance(obj, Decimal128):
+        return float(obj.to_decimal())
+    # Remaining BSON types (UUID, Timestamp, Regex, DBRef, ...) as MongoDB Extended JSON;
+    # raises TypeError for anything that isn't BSON
+    return json_util.default(obj)
+
+def dumps_mongo(content) -> bytes:
+    """Serialize raw MongoDB documents to JSON bytes"""
+    return orjson.dumps(content, default=orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+class MongoJSONResponse(JSONResponse):
+    """JSON response rendered by orjson, accepting raw MongoDB documents"""
+    def render(self, content) -> bytes:
+        return dumps_mongo(content)
+
+async def stream_json_array(cursor, head: Optional[dict] = None):
+    """
+    Yield a cursor's documents as a JSON array, serializing one document at a time.
+    The 200 status is already sent while this runs, so the response can be partial:
+    a database error mid-stream is logged and the array is left unterminated,
+    so clients get invalid JSON rather than a silently truncated list.
+    """
+    yield b"["
+    sep = b""
+    if head is not None:
+        yield dumps_mongo(head)
+        sep = b","
+    try:
+        async for doc in cursor:
+            yield sep + dumps_mongo(doc)
+            sep = b","
+    except PyMongoError as e:
+        logger.error(f"Streamed response aborted by a database error: {e}")
+        await cursor.close()
+        return
+    yield b"]"
+
+def stream_from(cursor, head: Optional[dict]):
+    """Stream the rest of a cursor whose first document (head) was already fetched"""
+    if head is None:
+        return MongoJSONResponse([])
+    return StreamingResponse(stream_json_array(cursor, head), media_type="application/json")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Ensure indexes used by the API queries exist; close the client on shutdown"""
+    await db["users"].create_index("role")
+    # Unique indexes fail on ETL-loaded duplicates; log and serve anyway rather than not start
+    for field, options in (("username", {}), ("email", {"sparse": True})):
+        try:
+            await db["users"].create_index(field, unique=True, **options)
+        except OperationFailure as e:
+            logger.error(f"Could not create unique index on users.{field}: {e}")
+    # Backs the title sort; searches are case-insensitive regexes, not $text
+    await db["books"].create_index("title")
+    # One process pool for bulk password hashing, started once rather than per request
+    global password_pool
+    password_pool = ProcessPoolExecutor(max_workers=PASSWORD_HASH_WORKERS)
+    yield
+    password_pool.shutdown(cancel_futures=True)
+    await client.close()
 
 # Initialize FastAPI
 app = FastAPI(
     title="Book Club API",
     description="Admin portal API for book club management",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=MongoJSONResponse
 )
 
 # CORS middleware - configure based on your needs
@@ -34,15 +132,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# MongoDB connection
-client = MongoClient(MONGODB_URI)
+# MongoDB connection (async driver, so queries run on the event loop)
+client = AsyncMongoClient(
+    MONGODB_URI,
+    maxPoolSize=MONGODB_MAX_POOL_SIZE,
+    minPoolSize=5,
+    maxIdleTimeMS=60000,
+    waitQueueTimeoutMS=2000,
+    compressors="zstd,zlib"
+)
 db = client[DATABASE_NAME]
 
 # Security
 security = HTTPBearer()
 
+# Process pool for bulk bcrypt hashing, created and shut down in lifespan
+password_pool: Optional[ProcessPoolExecutor] = None
+
+# Dashboard statistics cache
+stats_cache = TTLCache(maxsize=1, ttl=STATS_CACHE_TTL_SECONDS)
+
+# Authenticated user cache, keyed on bearer token -> (token expiry, user)
+auth_cache = TTLCache(maxsize=2048, ttl=AUTH_CACHE_TTL_SECONDS)
+
 # Pydantic models
-class LoginRequest(BaseModel):
+class RequestModel(BaseModel):
+    """Base for request bodies: reject unknown fields, immutable once parsed"""
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+class LoginRequest(RequestModel):
     username_or_email: str
     password: str
 
@@ -51,32 +169,33 @@ class TokenResponse(BaseModel):
     token_type: str
     user: dict
 
-class UserCreate(BaseModel):
+class UserCreate(RequestModel):
     username: str
     email: EmailStr
     password: str
     role: str = "member"
 
-class UserUpdate(BaseModel):
+class UserUpdate(RequestModel):
     role: Optional[str] = None
 
-class BookCreate(BaseModel):
+class BookCreate(RequestModel):
     title: str
     author: str
     description: Optional[str] = None
     isbn: Optional[str] = None
     genre: Optional[str] = None
 
-class ClubCreate(BaseModel):
+class ClubCreate(RequestModel):
     name: str
     description: Optional[str] = None
 
-class DiscussionCreate(BaseModel):
+class DiscussionCreate(RequestModel):
     title: str
     book_id: Optional[str] = None
     club_id: Optional[str] = None
 
 # Helper functions
+@functools.lru_cache(maxsize=4096)
 def hash_email(email: str) -> str:
     """Hash email address with SHA-256"""
     return hashlib.sha256(email.lower().encode('utf-8')).hexdigest()
@@ -89,14 +208,25 @@ def verify_password(plain_password: str, hashed_password: bytes) -> bool:
 
 def hash_password(password: str) -> bytes:
     """Hash password with bcrypt"""
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_ROUNDS))
+
+def to_object_id(value: str) -> ObjectId:
+    """Convert a client-supplied id to ObjectId, raising 400 if malformed"""
+    try:
+        return ObjectId(value)
+    except (InvalidId, TypeError):
+        raise HTTPException(status_code=400, detail=f"Invalid id: {value}")
+
+def object_id_path(name: str):
+    """Build a dependency that validates the named path parameter as an ObjectId"""
+    def dependency(value: str = Path(alias=name)) -> ObjectId:
+        return to_object_id(value)
+    return dependency
 
 def create_access_token(data: dict) -> str:
     """Create JWT access token"""
-    to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode({**data, "exp": expire}, SIGNING_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 def serialize_doc(doc):
@@ -112,35 +242,55 @@ def serialize_doc(doc):
             doc[key] = str(value)
     return doc
 
-def serialize_docs(docs):
-    """Convert list of MongoDB documents"""
-    return [serialize_doc(doc) for doc in docs]
-
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Verify JWT token and return current user"""
+    token = credentials.credentials
+    cached = auth_cache.get(token)
+    if cached is not None and cached[0] > time.time():
+        return cached[1]
     try:
-        token = credentials.credentials
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, SIGNING_KEY, algorithms=ALGORITHMS)
         user_id = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid authentication credentials")
         
-        user = db["users"].find_one({"_id": ObjectId(user_id)})
+        user = await db["users"].find_one({"_id": ObjectId(user_id)}, USER_PROJECTION)
         if user is None:
             raise HTTPException(status_code=401, detail="User not found")
         
-        return serialize_doc(user)
+        user = serialize_doc(user)
+        auth_cache[token] = (payload["exp"], user)
+        return user
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token has expired")
-    except jwt.JWTError:
+    except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Could not validate credentials")
 
-async def require_admin(current_user: dict = Depends(get_current_user)):
-    """Require user to be admin"""
+def ensure_admin(current_user: dict) -> dict:
+    """Raise 403 unless the user is an admin"""
     if current_user.get("role") != "admin":
         raise HTTPException(status_code=403, detail="Admin privileges required")
     return current_user
 
+async def require_admin(current_user: dict = Depends(get_current_user)):
+    """Require user to be admin"""
+    return ensure_admin(current_user)
+
+async def run_as_admin(credentials: HTTPAuthorizationCredentials, query, cursor):
+    """
+    Run a read query on cursor alongside the admin check.
+    If the check fails (401/403), the query is cancelled and the cursor closed before re-raising.
+    """
+    query_task = asyncio.ensure_future(query)
+    try:
+        ensure_admin(await get_current_user(credentials))
+    except BaseException:
+        query_task.cancel()
+        await asyncio.gather(query_task, return_exceptions=True)
+        await cursor.close()
+        raise
+    return await query_task
+
 # Authentication endpoints
 @app.post("/api/auth/login", response_model=TokenResponse)
 async def login(request: LoginRequest):
@@ -148,14 +298,19 @@ async def login(request: LoginRequest):
     users_collection = db["users"]
     
     # Try username first
-    user = users_collection.find_one({"username": request.username_or_email})
+    user = await users_collection.find_one({"username": request.username_or_email})
     
     # If not found, try hashed email
     if not user:
         hashed_email = hash_email(request.username_or_email)
-        user = users_collection.find_one({"email": hashed_email})
+        user = await users_collection.find_one({"email": hashed_email})
     
-    if not user or not verify_password(request.password, user["password"]):
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    # bcrypt is CPU-bound, so keep it off the event loop
+    loop = asyncio.get_running_loop()
+    if not await loop.run_in_executor(None, verify_password, request.password, user["password"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     # Check admin status
@@ -165,9 +320,10 @@ async def login(request: LoginRequest):
     # Create access token
     access_token = create_access_token({"sub": str(user["_id"])})
     
-    # Remove password from response
+    # Remove password and ETL fields from response
     user_data = serialize_doc(user)
-    user_data.pop("password", None)
+    for field in USER_PROJECTION:
+        user_data.pop(field, None)
     
     return {
         "access_token": access_token,
@@ -178,20 +334,24 @@ async def login(request: LoginRequest):
 @app.get("/api/auth/me")
 async def get_me(current_user: dict = Depends(get_current_user)):
     """Get current user info"""
-    current_user.pop("password", None)
     return current_user
 
 # Statistics endpoint
 @app.get("/api/stats")
 async def get_stats(current_user: dict = Depends(require_admin)):
     """Get dashboard statistics"""
-    return {
-        "users_count": db["users"].count_documents({}),
-        "admin_count": db["users"].count_documents({"role": "admin"}),
-        "books_count": db["books"].count_documents({}),
-        "clubs_count": db["clubs"].count_documents({}),
-        "discussions_count": db["discussions"].count_documents({})
-    }
+    stats = stats_cache.get("stats")
+    if stats is None:
+        # Unfiltered totals come from collection metadata; the admin count uses the role index
+        stats = {
+            "users_count": await db["users"].estimated_document_count(),
+            "admin_count": await db["users"].count_documents({"role": "admin"}),
+            "books_count": await db["books"].estimated_document_count(),
+            "clubs_count": await db["clubs"].estimated_document_count(),
+            "discussions_count": await db["discussions"].estimated_document_count()
+        }
+        stats_cache["stats"] = stats
+    return stats
 
 # User management endpoints
 @app.get("/api/users")
@@ -199,24 +359,24 @@ async def list_users(
     search: Optional[str] = None,
     role: Optional[str] = None,
     limit: int = 100,
-    current_user: dict = Depends(require_admin)
+    credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
     """List users with optional filters"""
     query = {}
     if search:
-        query["username"] = {"$regex": search, "$options": "i"}
+        # Case-insensitive substring match on the literal search text ("smith" finds
+        # "johnsmith"). The regex can't bound the scan, but it is tested against username
+        # index keys walked in sort order, so the scan stops once limit users match
+        query["username"] = {"$regex": re.escape(search), "$options": "i"}
     if role and role != "All":
         if role == "Admin":
             query["role"] = "admin"
         elif role == "Member":
             query["role"] = {"$ne": "admin"}
     
-    users = list(db["users"].find(query).sort("username", 1).limit(limit))
-    # Remove passwords
-    for user in users:
-        user.pop("password", None)
-    
-    return serialize_docs(users)
+    cursor = db["users"].find(query, USER_PROJECTION).sort("username", 1).limit(limit)
+    users = await run_as_admin(credentials, cursor.to_list(), cursor)
+    return MongoJSONResponse(users)
 
 @app.post("/api/users", status_code=status.HTTP_201_CREATED)
 async def create_user(user: UserCreate, current_user: dict = Depends(require_admin)):
@@ -224,28 +384,88 @@ async def create_user(user: UserCreate, current_user: dict = Depends(require_adm
     users_collection = db["users"]
     
     # Check if username exists
-    if users_collection.find_one({"username": user.username}):
+    if await users_collection.find_one({"username": user.username}):
         raise HTTPException(status_code=400, detail="Username already exists")
     
-    # Create user
+    # Create user (bcrypt is CPU-bound, so keep it off the event loop)
+    loop = asyncio.get_running_loop()
     new_user = {
         "username": user.username,
         "email": hash_email(user.email),
-        "password": hash_password(user.password),
+        "password": await loop.run_in_executor(None, hash_password, user.password),
         "role": user.role,
         "created_at": datetime.now()
     }
     
-    result = users_collection.insert_one(new_user)
+    result = await users_collection.insert_one(new_user)
     new_user["_id"] = result.inserted_id
     new_user.pop("password")
     
     return serialize_doc(new_user)
 
+@app.post("/api/users/bulk", status_code=status.HTTP_201_CREATED)
+async def create_users_bulk(users: List[UserCreate], current_user: dict = Depends(require_admin)):
+    """Create many users at once, hashing passwords across processes"""
+    if not users:
+        raise HTTPException(status_code=400, detail="No users to create")
+    if len(users) > MAX_BULK_USERS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {MAX_BULK_USERS} users can be created per request"
+        )
+
+    # Reject repeated names up front; the unique index may be missing, so it can't be relied on
+    name_counts = Counter(user.username for user in users)
+    repeated = sorted(name for name, count in name_counts.items() if count > 1)
+    if repeated:
+        raise HTTPException(
+            status_code=400, detail=f"Usernames repeated in request: {', '.join(repeated)}"
+        )
+
+    # Existing usernames are reported as failed, like create_user's check, and never hashed
+    existing = {
+        doc["username"] async for doc in db["users"].find(
+            {"username": {"$in": list(name_counts)}}, {"username": 1, "_id": 0}
+        )
+    }
+    failed = [user.username for user in users if user.username in existing]
+    users = [user for user in users if user.username not in existing]
+    if not users:
+        return {"inserted_count": 0, "failed": failed}
+
+    # bcrypt releases the GIL, but a dedicated pool keeps a large batch from tying up
+    # the default executor that logins and create_user hash on
+    loop = asyncio.get_running_loop()
+    hashes = await asyncio.gather(
+        *(loop.run_in_executor(password_pool, hash_password, user.password) for user in users)
+    )
+
+    now = datetime.now()
+    new_users = [
+        {
+            "username": user.username,
+            "email": hash_email(user.email),
+            "password": hashed,
+            "role": user.role,
+            "created_at": now
+        }
+        for user, hashed in zip(users, hashes)
+    ]
+
+    # Unordered, so a concurrent duplicate caught by the unique index does not stop the rest
+    try:
+        result = await db["users"].insert_many(new_users, ordered=False)
+        inserted_count = len(result.inserted_ids)
+    except BulkWriteError as e:
+        inserted_count = e.details["nInserted"]
+        failed += [users[err["index"]].username for err in e.details["writeErrors"]]
+
+    return {"inserted_count": inserted_count, "failed": failed}
+
 @app.patch("/api/users/{user_id}")
 async def update_user(
-    user_id: str,
     update: UserUpdate,
+    user_id: ObjectId = Depends(object_id_path("user_id")),
     current_user: dict = Depends(require_admin)
 ):
     """Update user (currently just role)"""
@@ -258,28 +478,33 @@ async def update_user(
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields to update")
     
-    result = users_collection.update_one(
-        {"_id": ObjectId(user_id)},
+    result = await users_collection.update_one(
+        {"_id": user_id},
         {"$set": update_data}
     )
     
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
     
+    auth_cache.clear()
     return {"message": "User updated successfully"}
 
 @app.delete("/api/users/{user_id}")
-async def delete_user(user_id: str, current_user: dict = Depends(require_admin)):
+async def delete_user(
+    user_id: ObjectId = Depends(object_id_path("user_id")),
+    current_user: dict = Depends(require_admin)
+):
     """Delete a user"""
     # Prevent self-deletion
-    if current_user["_id"] == user_id:
+    if current_user["_id"] == str(user_id):
         raise HTTPException(status_code=400, detail="Cannot delete your own account")
     
-    result = db["users"].delete_one({"_id": ObjectId(user_id)})
+    result = await db["users"].delete_one({"_id": user_id})
     
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
     
+    auth_cache.clear()
     return {"message": "User deleted successfully"}
 
 # Book management endpoints
@@ -287,18 +512,19 @@ async def delete_user(user_id: str, current_user: dict = Depends(require_admin))
 async def list_books(
     search: Optional[str] = None,
     limit: int = 100,
-    current_user: dict = Depends(require_admin)
+    credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
     """List books with optional search"""
     query = {}
     if search:
-        query = {"$or": [
-            {"title": {"$regex": search, "$options": "i"}},
-            {"author": {"$regex": search, "$options": "i"}}
-        ]}
+        # Case-insensitive substring match, so partial words and prefixes still find books
+        pattern = {"$regex": re.escape(search), "$options": "i"}
+        query = {"$or": [{"title": pattern}, {"author": pattern}]}
     
-    books = list(db["books"].find(query).sort("title", 1).limit(limit))
-    return serialize_docs(books)
+    # Only the first document is awaited alongside the admin check; the rest is streamed
+    cursor = db["books"].find(query, HIDDEN_FIELDS).sort("title", 1).limit(limit)
+    head = await run_as_admin(credentials, anext(cursor, None), cursor)
+    return stream_from(cursor, head)
 
 @app.post("/api/books", status_code=status.HTTP_201_CREATED)
 async def create_book(book: BookCreate, current_user: dict = Depends(require_admin)):
@@ -313,15 +539,18 @@ async def create_book(book: BookCreate, current_user: dict = Depends(require_adm
         "added_by": current_user["username"]
     }
     
-    result = db["books"].insert_one(new_book)
+    result = await db["books"].insert_one(new_book)
     new_book["_id"] = result.inserted_id
     
     return serialize_doc(new_book)
 
 @app.delete("/api/books/{book_id}")
-async def delete_book(book_id: str, current_user: dict = Depends(require_admin)):
+async def delete_book(
+    book_id: ObjectId = Depends(object_id_path("book_id")),
+    current_user: dict = Depends(require_admin)
+):
     """Delete a book"""
-    result = db["books"].delete_one({"_id": ObjectId(book_id)})
+    result = await db["books"].delete_one({"_id": book_id})
     
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Book not found")
@@ -332,8 +561,9 @@ async def delete_book(book_id: str, current_user: dict = Depends(require_admin))
 @app.get("/api/clubs")
 async def list_clubs(current_user: dict = Depends(require_admin)):
     """List all clubs"""
-    clubs = list(db["clubs"].find().sort("name", 1))
-    return serialize_docs(clubs)
+    cursor = db["clubs"].find({}, HIDDEN_FIELDS).sort("name", 1)
+    # Fetch the first batch before streaming, so query errors still return a 500
+    return stream_from(cursor, await anext(cursor, None))
 
 @app.post("/api/clubs", status_code=status.HTTP_201_CREATED)
 async def create_club(club: ClubCreate, current_user: dict = Depends(require_admin)):
@@ -346,15 +576,18 @@ async def create_club(club: ClubCreate, current_user: dict = Depends(require_adm
         "created_by": current_user["username"]
     }
     
-    result = db["clubs"].insert_one(new_club)
+    result = await db["clubs"].insert_one(new_club)
     new_club["_id"] = result.inserted_id
     
     return serialize_doc(new_club)
 
 @app.delete("/api/clubs/{club_id}")
-async def delete_club(club_id: str, current_user: dict = Depends(require_admin)):
+async def delete_club(
+    club_id: ObjectId = Depends(object_id_path("club_id")),
+    current_user: dict = Depends(require_admin)
+):
     """Delete a club"""
-    result = db["clubs"].delete_one({"_id": ObjectId(club_id)})
+    result = await db["clubs"].delete_one({"_id": club_id})
     
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Club not found")
@@ -365,8 +598,9 @@ async def delete_club(club_id: str, current_user: dict = Depends(require_admin))
 @app.get("/api/discussions")
 async def list_discussions(current_user: dict = Depends(require_admin)):
     """List all discussions"""
-    discussions = list(db["discussions"].find().sort("_id", -1).limit(100))
-    return serialize_docs(discussions)
+    cursor = db["discussions"].find({}, HIDDEN_FIELDS).sort("_id", -1).limit(100)
+    # Fetch the first batch before streaming, so query errors still return a 500
+    return stream_from(cursor, await anext(cursor, None))
 
 @app.post("/api/discussions", status_code=status.HTTP_201_CREATED)
 async def create_discussion(
@@ -382,19 +616,22 @@ async def create_discussion(
     }
     
     if discussion.book_id:
-        new_discussion["book_id"] = ObjectId(discussion.book_id)
+        new_discussion["book_id"] = to_object_id(discussion.book_id)
     if discussion.club_id:
-        new_discussion["club_id"] = ObjectId(discussion.club_id)
+        new_discussion["club_id"] = to_object_id(discussion.club_id)
     
-    result = db["discussions"].insert_one(new_discussion)
+    result = await db["discussions"].insert_one(new_discussion)
     new_discussion["_id"] = result.inserted_id
     
     return serialize_doc(new_discussion)
 
 @app.delete("/api/discussions/{discussion_id}")
-async def delete_discussion(discussion_id: str, current_user: dict = Depends(require_admin)):
+async def delete_discussion(
+    discussion_id: ObjectId = Depends(object_id_path("discussion_id")),
+    current_user: dict = Depends(require_admin)
+):
     """Delete a discussion"""
-    result = db["discussions"].delete_one({"_id": ObjectId(discussion_id)})
+    result = await db["discussions"].delete_one({"_id": discussion_id})
     
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Discussion not found")
@@ -3,7 +3,7 @@ import json
 import streamlit as st
 from bson import ObjectId
 import pandas as pd
-from src.admin_interface.utils.utils import fetch_documents, insert_document, convert_objectids
+from src.admin_portal.frontend.utils.utils import fetch_documents, insert_document, convert_objectids
 from src.db.utils.connectors import connect_mongodb
 
 db, client = connect_mongodb()
@@ -14,7 +14,7 @@ operation = st.sidebar.radio("Operation", ["View", "Add", "Update", "Delete"])
 
 if operation == "View":
     docs = fetch_documents(db, collection)
-    df = pd.DataFrame([convert_objectids(doc) for doc in docs])
+    df = pd.DataFrame(convert_objectids(docs))
     st.dataframe(df)
 
 elif operation == "Add":
@@ -2,14 +2,24 @@
 from bson import ObjectId
 
 def convert_objectids(doc):
-    if isinstance(doc, dict):
-        return {k: convert_objectids(v) for k, v in doc.items()}
-    elif isinstance(doc, list):
-        return [convert_objectids(i) for i in doc]
-    elif isinstance(doc, ObjectId):
+    """Convert nested ObjectIds to strings in place, walking with a stack instead of recursion"""
+    if isinstance(doc, ObjectId):
         return str(doc)
-    else:
-        return doc
+    stack = [doc]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            items = node.items()
+        elif isinstance(node, list):
+            items = enumerate(node)
+        else:
+            continue
+        for key, value in items:
+            if isinstance(value, ObjectId):
+                node[key] = str(value)
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
+    return doc
 
 def get_collection_names(db):
     return db.list_collection_names()
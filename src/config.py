@@ -16,6 +16,8 @@ neo4j_user = os.getenv("NEO4J_USERNAME")
 neo4j_pwd = os.getenv("NEO4J_PASSWORD")
 key_registry_path = os.getenv("ENCRYPTION_KEYS")
 hf_token = os.getenv("HUGGINGFACE_HUB_TOKEN")
+# Processes for the optional transform pools; 1 keeps transforms serial
+transform_workers = int(os.getenv("TRANSFORM_WORKERS", "1"))
 
 
 # Paths
@@ -32,6 +34,7 @@ COVER_ART_DIR = EXTERNAL_DATA_DIR / "cover_art"
 RAW_TABLES_DIR = RAW_DATA_DIR / "raw_tables"
 RAW_COLLECTIONS_DIR = RAW_DATA_DIR / "raw_collections"
 TRANSFORMED_COLLECTIONS_DIR = PROCESSED_DATA_DIR / "transformed_collections"
+SYNC_HASHES_DIR = INTERIM_DATA_DIR / "sync_hashes"
 ETL_LOGS_DIR = PROJ_ROOT / "src" / "db" / "etl" / "logs"
 
 MODELS_DIR = PROJ_ROOT / "models"
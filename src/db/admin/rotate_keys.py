@@ -1,5 +1,6 @@
 # import modules
 from loguru import logger
+from pymongo import UpdateOne
 from pymongo.errors import ConnectionFailure, ConfigurationError
 from src.db.utils.connectors import connect_mongodb
 from src.db.utils.security import decrypt_field, encrypt_field, latest_key_version
@@ -15,14 +16,17 @@ encrypted_fields = [
     "user_city", "user_state", "user_country"
 ]
 
+BATCH_SIZE = 1000
+
 
 def rotate_user_document(doc):
     """
     Decrypts and encrypts user document with new key version.
+    Returns the UpdateOne to apply, or None if nothing changed.
     """
     old_key_version = doc.get("key_version")
     if old_key_version == latest_key_version:
-        return False  # Already up to date
+        return None  # Already up to date
 
     updated_fields = {}
     for field in encrypted_fields:
@@ -36,21 +40,30 @@ def rotate_user_document(doc):
 
     if updated_fields:
         updated_fields["key_version"] = latest_key_version
-        users.update_one({"_id": doc["_id"]}, {"$set": updated_fields})
-        logger.info(f"Rotated user {doc.get('_id')} to key version '{latest_key_version}'")
-        return True
-    return False
+        return UpdateOne({"_id": doc["_id"]}, {"$set": updated_fields})
+    return None
 
 
 def rotate_all_users():
     """
     Rotates encryption for all user documents.
     """
-    outdated_users = users.find({"key_version": {"$ne": latest_key_version}})
+    projection = dict.fromkeys(encrypted_fields + ["key_version"], 1)
+    outdated_users = users.find(
+        {"key_version": {"$ne": latest_key_version}}, projection
+    ).batch_size(BATCH_SIZE)
+
     count = 0
+    ops = []
     for user in outdated_users:
-        if rotate_user_document(user):
-            count += 1
+        op = rotate_user_document(user)
+        if op is not None:
+            ops.append(op)
+        if len(ops) >= BATCH_SIZE:
+            count += users.bulk_write(ops, ordered=False).modified_count
+            ops.clear()
+    if ops:
+        count += users.bulk_write(ops, ordered=False).modified_count
     logger.info(f"Rotated {count} user documents to key version '{latest_key_version}'")
 
 
@@ -1,39 +1,28 @@
 '''Run full ELT Pipeline.'''
 
 # Import modules
-import subprocess
+import importlib
 import sys
 from loguru import logger
 from src.db.utils.files import wipe_directory
 from src.config import TRANSFORMED_COLLECTIONS_DIR
 
-def run_script(script_path):
+def run_script(module_name):
     """
-    Runs a Python script using a subprocess and logs its output.
+    Imports a pipeline module and runs its main() in this interpreter,
+    so imports and connections are shared across steps.
     Returns True if the script ran successfully, False otherwise.
     """
-    logger.info(f"Starting execution of {script_path}...")
+    logger.info(f"Starting execution of {module_name}...")
     try:
-        result = subprocess.run(
-            [sys.executable, script_path],
-            check=True,
-            capture_output=True,
-            text=True
-        )
-        logger.info(f"Successfully ran {script_path}")
-        logger.info("Script output:")
-        logger.info(result.stdout)
+        importlib.import_module(module_name).main()
+        logger.info(f"Successfully ran {module_name}")
         return True
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Failed to run {script_path}. Script returned an error.")
-        logger.error(f"Stdout:\n{e.stdout}")
-        logger.error(f"Stderr:\n{e.stderr}")
+    except ModuleNotFoundError as e:
+        logger.error(f"The module {module_name} was not found: {e}")
         return False
-    except FileNotFoundError:
-        logger.error(f"The script file was not found at {script_path}. Please check the path.")
-        return False
-    except (KeyError, TypeError, ValueError) as e:
-        logger.error(f"An unexpected error occurred while running {script_path}: {e}")
+    except (Exception, SystemExit) as e:  # pylint: disable=broad-exception-caught
+        logger.exception(f"Failed to run {module_name}: {e!r}")
         return False
 
 def main():
@@ -41,16 +30,16 @@ def main():
     Main function to run the ELT pipeline in sequence.
     """
     scripts_to_run = [
-        "src/db/etl/extract/sync_gsheet.py",
-        "src/db/etl/transforms/transform_clubs.py",
-        "src/db/etl/transforms/transform_users.py",
-        "src/db/etl/transforms/transform_books.py",
-        "src/db/etl/transforms/transform_creators.py",
-        "src/db/etl/transforms/transform_awards.py",
-        "src/db/etl/utilityscripts/sync_images.py",
-        "src/db/etl/transforms/cleanup.py",
-        "src/db/etl/load/load_mongo.py",
-        "src/db/etl/load/load_aura.py"
+        "src.db.etl.extract.sync_gsheet",
+        "src.db.etl.transforms.transform_clubs",
+        "src.db.etl.transforms.transform_users",
+        "src.db.etl.transforms.transform_books",
+        "src.db.etl.transforms.transform_creators",
+        "src.db.etl.transforms.transform_awards",
+        "src.db.etl.utilityscripts.sync_images",
+        "src.db.etl.transforms.cleanup",
+        "src.db.etl.load.load_mongo",
+        "src.db.etl.load.load_aura"
     ]
 
     for script in scripts_to_run:
@@ -2,45 +2,33 @@
 
 # Imports
 import os
-import json
-import time
-import gspread
-from bson.objectid import ObjectId
 from loguru import logger
-from src.db.utils.connectors import connect_googlesheet
-from src.db.utils.files import wipe_directory
+from src.db.utils.connectors import connect_googlesheet, fetch_sheet_records
+from src.db.utils.files import wipe_directory, write_json, generate_object_ids
 from src.config import RAW_COLLECTIONS_DIR
 
-# Connect to Book Club DB spreadsheet
-spreadsheet = connect_googlesheet()
-
 # Function to extract sheets and save directly to JSON
-def extract_sheets_to_json(sheet_names):
+def extract_sheets_to_json(spreadsheet, sheet_names):
     """
     Extracts data from specified sheets, adds ObjectId, saves to RAW_COLLECTIONS_DIR as JSON.
     """
-    for name in sheet_names:
-        try:
-            sheet = spreadsheet.worksheet(name)  # type: ignore
-            records = sheet.get_all_records()
+    records_by_sheet = fetch_sheet_records(spreadsheet, sheet_names)
 
-            if records:
-                documents = []
-                for row in records:
-                    doc = {"_id": str(ObjectId())}
-                    doc.update(row) # type: ignore
-                    documents.append(doc)
+    for name in sheet_names:
+        if name not in records_by_sheet:
+            continue  # Fetch error already logged
 
-                output_path = os.path.join(RAW_COLLECTIONS_DIR, f"{name}.json")
-                with open(output_path, "w", encoding="utf-8") as f:
-                    json.dump(documents, f, ensure_ascii=False, indent=2)
+        records = records_by_sheet[name]
+        if records:
+            ids = generate_object_ids(len(records))
+            documents = [{"_id": _id, **row} for _id, row in zip(ids, records)] # type: ignore
 
-                logger.info(f"Saved {len(documents)} records to '{output_path}'")
-            else:
-                logger.warning(f"No records found in sheet '{name}'")
+            output_path = os.path.join(RAW_COLLECTIONS_DIR, f"{name}.json")
+            write_json(output_path, documents)
 
-        except gspread.exceptions.APIError as e:
-            logger.error(f"APIError for sheet '{name}': {e}")
+            logger.info(f"Saved {len(documents)} records to '{output_path}'")
+        else:
+            logger.warning(f"No records found in sheet '{name}'")
 
 # Sheet groups
 book_sheets = [
@@ -59,13 +47,19 @@ club_sheets = [
 
 other = ["countries"]
 
+all_sheets = book_sheets + user_sheets + club_sheets + other
+
+
 # Run extraction
-if __name__ == "__main__":
+def main():
+    """Extract all sheet groups to raw JSON collections."""
+    # Connect to Book Club DB spreadsheet
+    spreadsheet = connect_googlesheet()
     wipe_directory(RAW_COLLECTIONS_DIR)
-    extract_sheets_to_json(book_sheets)
-    time.sleep(10)
-    extract_sheets_to_json(user_sheets)
-    time.sleep(10)
-    extract_sheets_to_json(club_sheets)
-    extract_sheets_to_json(other)
+    # One batchGet for every group instead of one request per group
+    extract_sheets_to_json(spreadsheet, all_sheets)
     logger.success("All raw collections saved to disk.")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,13 @@
 
 # Imports
 import os
-import json
-import time
-import copy
-import hashlib
+import orjson
+import xxhash
 from loguru import logger
-from bson.objectid import ObjectId
-from src.db.utils.connectors import connect_googlesheet
-from src.config import RAW_COLLECTIONS_DIR
-
-# Connect to Book Club DB spreadsheet
-spreadsheet = connect_googlesheet()
+from src.db.utils.connectors import connect_googlesheet, fetch_sheet_records
+from src.db.utils.files import read_json, write_json, generate_object_ids
+from src.db.etl.extract.extract_gsheet import all_sheets
+from src.config import RAW_COLLECTIONS_DIR, SYNC_HASHES_DIR
 
 # Define unique id maps to check when updating data
 id_map = {
@@ -46,42 +42,82 @@ id_map = {
     "countries": ["name"]
 }
 
+# Identifies how hash_doc builds hashes; stored in each hash index so that changing
+# the hash function or serialization invalidates indexes saved by earlier syncs
+HASH_FORMAT = "xxh3_64-orjson-sorted-v1"
+
 # Sync sheets and update JSON with changes
 def hash_doc(doc:dict):
-    """Hash a dict."""
-    hsh = hashlib.sha1(json.dumps(doc, sort_keys=True).encode()).hexdigest()
+    """
+    Hash a dict (non-cryptographic, only used to detect changes between syncs).
+    Hashes are persisted in SYNC_HASHES_DIR, so bump HASH_FORMAT if this changes.
+    """
+    hsh = xxhash.xxh3_64_intdigest(orjson.dumps(doc, option=orjson.OPT_SORT_KEYS))
 
     return hsh
 
 def add_hashes(documents: list, sheet_name):
-    """Adds hash to each doc by hashing unique identifiers."""
-    copy_1 = copy.deepcopy(documents)
-    copy_2 = copy.deepcopy(documents)
-
+    """
+    Adds hash (unique identifiers) and content_hash (all fields but _id)
+    to each doc in place.
+    """
     identifier_fields = id_map[sheet_name]
     hashes = []
 
-    for doc, d_doc in zip(copy_1, copy_2):
+    for doc in documents:
         doc.pop("hash", None)
-        d_doc.pop("hash", None)
-        d_doc.pop("_id", None)
+        doc.pop("content_hash", None)
 
-        hsh = hash_doc(d_doc)
-        if identifier_fields != []:
-            subdoc = {}
-            for k in identifier_fields:
-                subdoc[k] = d_doc[k]
-            hsh = hash_doc(subdoc)
+        content_hash = hash_doc({k: v for k, v in doc.items() if k != "_id"})
+        if identifier_fields:
+            hsh = hash_doc({k: doc[k] for k in identifier_fields})
+        else:
+            hsh = content_hash
 
         doc["hash"] = hsh
+        doc["content_hash"] = content_hash
         hashes.append(hsh)
 
-    return copy_1, hashes
+    return documents, hashes
 
-def update_records(old_documents, new_documents):
-    """Return updated docs and structured diff of changes."""
+def load_hashes(old_documents: list, sheet_name):
+    """
+    Assigns stored hashes from the last sync to docs loaded from disk.
+    Returns None if the index is missing, stale, or was built from other identifier fields
+    or another HASH_FORMAT.
+    """
+    try:
+        index = read_json(os.path.join(SYNC_HASHES_DIR, f"{sheet_name}.json"))
+    except (FileNotFoundError, ValueError):
+        return None
+
+    if index.get("format") != HASH_FORMAT or index.get("fields") != id_map[sheet_name]:
+        return None
+
+    stored = index.get("hashes", {})
+    entries = [stored.get(doc.get("_id")) for doc in old_documents]
+    if not all(isinstance(entry, list) for entry in entries):
+        return None
 
-    new_lookup = {doc["hash"]: doc for doc in new_documents}
+    for doc, (hsh, content_hash) in zip(old_documents, entries):
+        doc["hash"] = hsh
+        doc["content_hash"] = content_hash
+    return [entry[0] for entry in entries]
+
+def save_hashes(documents: list, hashes: list, sheet_name):
+    """
+    Stores _id -> [hash, content_hash] for the saved docs
+    so the next sync can skip rehashing them.
+    """
+    os.makedirs(SYNC_HASHES_DIR, exist_ok=True)
+    write_json(os.path.join(SYNC_HASHES_DIR, f"{sheet_name}.json"), {
+        "format": HASH_FORMAT,
+        "fields": id_map[sheet_name],
+        "hashes": {doc["_id"]: hsh for doc, hsh in zip(documents, hashes)}
+    })
+
+def update_records(old_documents, new_by_hash):
+    """Return updated docs and structured diff of changes."""
 
     updated_docs = []
     diff = {
@@ -91,21 +127,23 @@ def update_records(old_documents, new_documents):
 
     for old_doc in old_documents:
         old_hash = old_doc["hash"]
-        new_doc = new_lookup.get(old_hash)
+        new_doc = new_by_hash.get(old_hash)
 
-        if not new_doc:
+        # Missing from the sheet, or identical content: nothing to compare
+        if not new_doc or old_doc["content_hash"] == new_doc["content_hash"]:
             diff["unchanged"].append(old_doc)
             updated_docs.append(old_doc)
             continue
 
         changes = {}
         for key, new_value in new_doc.items():
-            if key == "_id":
+            if key in ("_id", "content_hash"):
                 continue
             old_value = old_doc.get(key)
             if old_value != new_value:
                 changes[key] = {"from": old_value, "to": new_value}
                 old_doc[key] = new_value
+        old_doc["content_hash"] = new_doc["content_hash"]
 
         if changes:
             diff["updated"].append({
@@ -124,61 +162,76 @@ def update_records(old_documents, new_documents):
 
 def cleanup(documents:list):
     """Adds ObjectIds to docs that don't have one and removes hashes."""
+    new_ids = iter(generate_object_ids(sum(doc.get("_id") is None for doc in documents)))
     new_documents = []
     for doc in documents:
         if doc.get("_id", None) is None:
-            new_doc = {"_id": str(ObjectId())}
+            new_doc = {"_id": next(new_ids)}
             new_doc.update(doc)
             new_doc.pop("hash", None)
+            new_doc.pop("content_hash", None)
             new_documents.append(new_doc)
         else:
             doc.pop("hash", None)
+            doc.pop("content_hash", None)
             new_documents.append(doc)
 
     return new_documents
 
 
-def sync_sheet(sheet_names):
+def sync_sheet(spreadsheet, sheet_names):
     """Sync GSheets"""
 
     if spreadsheet is None:
         logger.error("Failed to connect to Google Sheets")
         return
 
+    records_by_sheet = fetch_sheet_records(spreadsheet, sheet_names)
+
     for name in sheet_names:
-        sheet = spreadsheet.worksheet(name)
-        new_list = sheet.get_all_records()
+        if name not in records_by_sheet:
+            continue  # Fetch error already logged
+
+        new_list = records_by_sheet[name]
 
         if new_list:
             # Load old docs if present
             output_path = os.path.join(RAW_COLLECTIONS_DIR, f"{name}.json")
             try:
-                with open(output_path, "r", encoding="utf-8") as f:
-                    old_list = json.load(f)
+                old_list = read_json(output_path)
                 logger.info(f"Found {len(old_list)} stored records for '{name}'.")
             except FileNotFoundError:
                 logger.info(f"No stored records found for '{name}'. Saving as new.")
-                new_list = [{"_id": str(ObjectId()), **i} for i in new_list]
-                with open(output_path, "w", encoding="utf-8") as f:
-                    json.dump(new_list, f, ensure_ascii=False, indent=2)
+                ids = generate_object_ids(len(new_list))
+                new_list = [{"_id": _id, **i} for _id, i in zip(ids, new_list)]
+                write_json(output_path, new_list)
                 logger.info(f"Saved {len(new_list)} records to '{output_path}'")
                 continue
         else:
             logger.warning(f"No records found in sheet '{name}'")
+            continue
 
         # Add hashes to list entries
         new_list, new_hashes = add_hashes(new_list, name)
-        old_list, old_hashes = add_hashes(old_list, name)
+        old_hashes = load_hashes(old_list, name)
+        if old_hashes is None:
+            old_list, old_hashes = add_hashes(old_list, name)
 
-        # Remove entries whose unique identifier hash isn't in the new hash list
-        records = [i for i in old_list if i["hash"] in new_hashes]
-        removed_entries = [i for i in old_list if i["hash"] not in new_hashes]
+        # Index new docs once: membership checks and update lookups share it
+        new_by_hash = dict(zip(new_hashes, new_list))
+        old_hash_set = set(old_hashes)
+
+        # Remove entries whose unique identifier hash isn't in the new hash set
+        records = []
+        removed_entries = []
+        for i in old_list:
+            (records if i["hash"] in new_by_hash else removed_entries).append(i)
 
         # Update existing records
-        records, update_diff = update_records(records, new_list)
+        records, update_diff = update_records(records, new_by_hash)
 
         # Add new entries
-        new_entries = [i for i in new_list if i["hash"] not in old_hashes]
+        new_entries = [i for i in new_list if i["hash"] not in old_hash_set]
         records = records + new_entries
 
         # Diff and sync summary
@@ -199,37 +252,24 @@ def sync_sheet(sheet_names):
             f"{summary['updated']} updated."
             )
 
-        # Preserve ObjectIds and remove hashes
+        # Preserve ObjectIds and remove hashes (cleanup keeps order)
+        hashes = [[i["hash"], i["content_hash"]] for i in records]
         records = cleanup(records)
 
         # Save
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(records, f, ensure_ascii=False, indent=2)
-
+        write_json(output_path, records)
+        save_hashes(records, hashes, name)
 
-# Sheet groups
-book_sheets = [
-    "books", "book_versions", "creators", "creator_roles", "genres", "book_series",
-    "awards", "publishers", "formats", "tags", "languages"
-]
 
-user_sheets = [
-    "users", "user_reads", "read_statuses", "user_badges", "user_roles", "user_permissions"
-]
-
-club_sheets = [
-    "clubs", "club_members", "club_member_reads", "club_reading_periods", "club_period_books",
-    "club_discussions", "club_events", "club_event_types", "club_event_statuses", "club_badges"
-]
+# Run extraction
+def main():
+    """Sync all sheet groups with the raw JSON collections."""
+    # Connect to Book Club DB spreadsheet
+    spreadsheet = connect_googlesheet()
+    # One batchGet for every group instead of one request per group
+    sync_sheet(spreadsheet, all_sheets)
+    logger.success("All raw collections saved to disk.")
 
-other = ["countries"]
 
-# Run extraction
 if __name__ == "__main__":
-    sync_sheet(book_sheets)
-    time.sleep(10)
-    sync_sheet(user_sheets)
-    time.sleep(10)
-    sync_sheet(club_sheets)
-    sync_sheet(other)
-    logger.success("All raw collections saved to disk.")
+    main()
@@ -3,26 +3,22 @@
 # Imports
 import os
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 from loguru import logger
 from src.db.utils.security import decrypt_field
 from src.db.utils.connectors import connect_mongodb, connect_auradb
-from src.db.utils.polyglot import (fetch_from_mongo, upsert_nodes, load_sync_log, update_sync_log,
-                                   ensure_constraints, process_books, create_relationships,
+from src.db.utils.polyglot import (fetch_from_mongo, fetch_many_from_mongo, upsert_nodes,
+                                   load_sync_log, update_sync_log, ensure_constraints,
+                                   process_books, create_relationships,
                                    badges_relationships, user_reads_relationships,
                                    book_awards_relationships, club_book_relationships,
-                                   cleanup_nodes, sync_deletions
+                                   cleanup_nodes, sync_deletions, run_write_jobs, in_transaction,
+                                   fetch_club_period_books
                                   )
 from src.config import ETL_LOGS_DIR
 
 
-# Timestamp and load sync log
-timestamp = datetime.datetime.now()
 SYNC_FILE = os.path.join(ETL_LOGS_DIR,"auradb_sync_log.json")
-sync_log, lst = load_sync_log(SYNC_FILE)
-
-# Connect to databases
-db, mongo = connect_mongodb()
-neo4j_driver = connect_auradb()
 
 # Field maps
 books_map = {
@@ -58,47 +54,37 @@ club_map = {
     "badge_timestamps": "badges.timestamp"
     }
 
-# Extract from MongoDB
-books = fetch_from_mongo(db["books"], field_map=books_map, since=lst)
-book_versions = fetch_from_mongo(db["book_versions"], field_map=bv_map, since=lst)
-book_series = fetch_from_mongo(db["book_series"], exclude_fields=["books"], since=lst)
-genres = fetch_from_mongo(db["genres"], exclude_fields=["date_added"], since=lst)
-awards = fetch_from_mongo(db["awards"], exclude_fields=["date_added"], since=lst)
-creators = fetch_from_mongo(db["creators"], exclude_fields=["date_added"], since=lst)
-creator_roles = fetch_from_mongo(db["creator_roles"], since=lst)
-publishers = fetch_from_mongo(db["publishers"], exclude_fields=["date_added"], since=lst)
-formats = fetch_from_mongo(db["formats"], since=lst)
-languages = fetch_from_mongo(db["languages"], since=lst)
-user_badges = fetch_from_mongo(db["user_badges"], exclude_fields=["date_added"], since=lst)
-club_badges = fetch_from_mongo(db["club_badges"], exclude_fields=["date_added"], since=lst)
-countries = fetch_from_mongo(db["countries"], since=lst)
-
 excluded_user_fields = [
     "firstname", "lastname", "email_address", "password", "dob", "gender",
     "city", "state", "is_admin", "last_active_date"
     ]
 excluded_club_fields = ["member_permissions", "join_requests", "moderators"]
 
-users = fetch_from_mongo(db["users"], excluded_user_fields, user_map, lst)
-clubs = fetch_from_mongo(db["clubs"], excluded_club_fields, club_map, lst)
-user_reads = fetch_from_mongo(db["user_reads"], since=lst)
-
-# Add information
-current_year = datetime.date.today().year
-for user in users:
-    goals = user["reading_goal"]
-    user["reading_goal"] = next((g["goal"] for g in goals if g["year"] == current_year), "N/A")
-    country = decrypt_field(user["country"], user["key_version"])
-    user["country"] = country
-    user.pop("key_version", None)
-
-for creator in creators:
-    lastname = creator.get("lastname", None)
-    creator["name"] = creator["firstname"] + f" {lastname}" if lastname else ""
+# Collections to fetch from MongoDB, with fetch_from_mongo kwargs
+fetch_specs = {
+    "books": {"field_map": books_map},
+    "book_versions": {"field_map": bv_map},
+    "book_series": {"exclude_fields": ["books"]},
+    "creators": {"exclude_fields": ["date_added"]},
+    "publishers": {"exclude_fields": ["date_added"]},
+    "users": {"exclude_fields": excluded_user_fields, "field_map": user_map},
+    "clubs": {"exclude_fields": excluded_club_fields, "field_map": club_map},
+    "user_reads": {},
+}
 
-books, book_awards = process_books(books)
+# Small reference collections, fetched together in a single aggregation
+reference_specs = {
+    "genres": {"exclude_fields": ["date_added"]},
+    "awards": {"exclude_fields": ["date_added"]},
+    "creator_roles": {},
+    "formats": {},
+    "languages": {},
+    "user_badges": {"exclude_fields": ["date_added"]},
+    "club_badges": {"exclude_fields": ["date_added"]},
+    "countries": {},
+}
 
-# Set constraints
+# Constraints map
 constraints_map = {
         "User": "_id",
         "Club": "_id",
@@ -113,28 +99,6 @@ constraints_map = {
         "Format": "name",
         "Language": "name"
     }
-ensure_constraints(neo4j_driver, constraints_map)
-
-# Sync deletions
-sync_deletions(neo4j_driver, db, lst)
-
-# Upsert nodes to Neo4j
-with neo4j_driver.session() as session:
-    session.execute_write(upsert_nodes, "Book", books)
-    session.execute_write(upsert_nodes, "BookVersion", book_versions)
-    session.execute_write(upsert_nodes, "BookSeries", book_series)
-    session.execute_write(upsert_nodes, "Genre", genres)
-    session.execute_write(upsert_nodes, "Award", awards)
-    session.execute_write(upsert_nodes, "Creator", creators)
-    session.execute_write(upsert_nodes, "CreatorRole", creator_roles)
-    session.execute_write(upsert_nodes, "Publisher", publishers)
-    session.execute_write(upsert_nodes, "Format", formats)
-    session.execute_write(upsert_nodes, "Language", languages)
-    session.execute_write(upsert_nodes, "User", users)
-    session.execute_write(upsert_nodes, "Club", clubs)
-    session.execute_write(upsert_nodes, "UserBadge", user_badges)
-    session.execute_write(upsert_nodes, "ClubBadge", club_badges)
-    session.execute_write(upsert_nodes, "Country", countries)
 
 # Edge maps
 book_genre_map = {"labels": ["Book", "Genre"], "props": ["genre", "name"]}
@@ -155,33 +119,7 @@ user_genre_map1 = {"labels": ["User", "Genre"], "props": ["preferred_genres", "n
 user_genre_map2 = {"labels": ["User", "Genre"], "props": ["forbidden_genres", "name"]}
 club_genre_map = {"labels": ["Club", "Genre"], "props": ["preferred_genres", "name"]}
 
-# Create node relationships
-with neo4j_driver.session() as session:
-    session.execute_write(create_relationships, book_genre_map, "HAS_GENRE", books)
-    session.execute_write(create_relationships, bv_book_map, "VERSION_OF", book_versions)
-    session.execute_write(create_relationships, book_series_map, "ENTRY_IN", books)
-    session.execute_write(create_relationships, book_author_map, "AUTHORED_BY", books)
-    session.execute_write(create_relationships, bv_narrator_map, "NARRATED_BY", book_versions)
-    session.execute_write(create_relationships, bv_cartist_map, "COVER_ART_BY", book_versions)
-    session.execute_write(create_relationships, bv_illustrator_map, "ILLUSTRATION_BY",book_versions)
-    session.execute_write(create_relationships, bv_translator_map, "TRANSLATED_BY", book_versions)
-    session.execute_write(create_relationships, bv_publisher_map, "PUBLISHED_BY", book_versions)
-    session.execute_write(create_relationships, bv_language_map, "HAS_LANGUAGE", book_versions)
-    session.execute_write(create_relationships, bv_format_map, "HAS_FORMAT", book_versions)
-    session.execute_write(create_relationships, creator_cr_map, "HAS_ROLE", creators)
-    session.execute_write(create_relationships, user_club_map, "MEMBER_OF", users)
-    session.execute_write(create_relationships, user_country_map, "LIVES_IN", users)
-    session.execute_write(create_relationships, user_genre_map1, "PREFERS_GENRE", users)
-    session.execute_write(create_relationships, user_genre_map2, "AVOIDS_GENRE", users)
-    session.execute_write(create_relationships, club_genre_map, "PREFERS_GENRE", clubs)
-
-    session.execute_write(user_reads_relationships, user_reads)
-    session.execute_write(badges_relationships, users, "User")
-    session.execute_write(badges_relationships, clubs, "Club")
-    session.execute_write(book_awards_relationships, books, book_awards)
-    session.execute_write(club_book_relationships, db)
-
-# Cleanup
+# Cleanup map
 cleanup_dict = {
     "Book": ["author_id", "series_id"],
     "BookVersion": ["book_id", "publisher_id", "narrator_id",
@@ -189,10 +127,125 @@ cleanup_dict = {
     "User": ["club_ids", "badge_timestamps"],
     "Club": ["created_by"],
 }
-cleanup_nodes(neo4j_driver, cleanup_dict)
 
-neo4j_driver.close()
 
-# Update sync log
-update_sync_log(sync_log, timestamp, SYNC_FILE)
-logger.success("Incremental sync completed successfully.")
+def main():
+    """Run an incremental MongoDB -> AuraDB sync."""
+    # Timestamp and load sync log
+    timestamp = datetime.datetime.now()
+    sync_log, lst = load_sync_log(SYNC_FILE)
+
+    # Connect to databases
+    db, _ = connect_mongodb()
+    neo4j_driver = connect_auradb()
+
+    # Extract from MongoDB (collections are independent, so fetch them concurrently)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        references = executor.submit(fetch_many_from_mongo, db, reference_specs, since=lst)
+        period_books = executor.submit(fetch_club_period_books, db)
+        futures = {
+            name: executor.submit(fetch_from_mongo, db[name], since=lst, **kwargs)
+            for name, kwargs in fetch_specs.items()
+        }
+        fetched = {name: future.result() for name, future in futures.items()}
+        fetched.update(references.result())
+        club_period_books = period_books.result()
+
+    books = fetched["books"]
+    book_versions = fetched["book_versions"]
+    book_series = fetched["book_series"]
+    genres = fetched["genres"]
+    awards = fetched["awards"]
+    creators = fetched["creators"]
+    creator_roles = fetched["creator_roles"]
+    publishers = fetched["publishers"]
+    formats = fetched["formats"]
+    languages = fetched["languages"]
+    user_badges = fetched["user_badges"]
+    club_badges = fetched["club_badges"]
+    countries = fetched["countries"]
+    users = fetched["users"]
+    clubs = fetched["clubs"]
+    user_reads = fetched["user_reads"]
+
+    # Add information
+    current_year = datetime.date.today().year
+    for user in users:
+        goals = user["reading_goal"]
+        user["reading_goal"] = {g["year"]: g["goal"] for g in goals}.get(current_year, "N/A")
+        country = decrypt_field(user["country"], user["key_version"])
+        user["country"] = country
+        user.pop("key_version", None)
+
+    for creator in creators:
+        name_parts = (creator.get("firstname"), creator.get("lastname"))
+        creator["name"] = " ".join(filter(None, name_parts))
+
+    books, book_awards = process_books(books)
+
+    # Set constraints
+    ensure_constraints(neo4j_driver, constraints_map)
+
+    # Sync deletions
+    sync_deletions(neo4j_driver, db, lst)
+
+    # Upsert nodes to Neo4j (labels are independent, so upserts run concurrently)
+    run_write_jobs(neo4j_driver, [
+        (upsert_nodes, "Book", books),
+        (upsert_nodes, "BookVersion", book_versions),
+        (upsert_nodes, "BookSeries", book_series),
+        (upsert_nodes, "Genre", genres),
+        (upsert_nodes, "Award", awards),
+        (upsert_nodes, "Creator", creators),
+        (upsert_nodes, "CreatorRole", creator_roles),
+        (upsert_nodes, "Publisher", publishers),
+        (upsert_nodes, "Format", formats),
+        (upsert_nodes, "Language", languages),
+        (upsert_nodes, "User", users),
+        (upsert_nodes, "Club", clubs),
+        (upsert_nodes, "UserBadge", user_badges),
+        (upsert_nodes, "ClubBadge", club_badges),
+        (upsert_nodes, "Country", countries),
+    ])
+
+    # Create node relationships once every node exists. Every edge job MERGEs onto endpoint
+    # nodes shared with other jobs (Book, Award, User, Genre, ...), so concurrent jobs would
+    # contend for the same node locks and deadlock; run them one after another.
+    relationship_jobs = [
+        (create_relationships, book_genre_map, "HAS_GENRE", books),
+        (create_relationships, bv_book_map, "VERSION_OF", book_versions),
+        (create_relationships, book_series_map, "ENTRY_IN", books),
+        (create_relationships, book_author_map, "AUTHORED_BY", books),
+        (create_relationships, bv_narrator_map, "NARRATED_BY", book_versions),
+        (create_relationships, bv_cartist_map, "COVER_ART_BY", book_versions),
+        (create_relationships, bv_illustrator_map, "ILLUSTRATION_BY", book_versions),
+        (create_relationships, bv_translator_map, "TRANSLATED_BY", book_versions),
+        (create_relationships, bv_publisher_map, "PUBLISHED_BY", book_versions),
+        (create_relationships, bv_language_map, "HAS_LANGUAGE", book_versions),
+        (create_relationships, bv_format_map, "HAS_FORMAT", book_versions),
+        (create_relationships, creator_cr_map, "HAS_ROLE", creators),
+        (create_relationships, user_club_map, "MEMBER_OF", users),
+        (create_relationships, user_country_map, "LIVES_IN", users),
+        (create_relationships, user_genre_map1, "PREFERS_GENRE", users),
+        (create_relationships, user_genre_map2, "AVOIDS_GENRE", users),
+        (create_relationships, club_genre_map, "PREFERS_GENRE", clubs),
+        (in_transaction(user_reads_relationships), user_reads),
+        (in_transaction(badges_relationships), users, "User"),
+        (in_transaction(badges_relationships), clubs, "Club"),
+        (book_awards_relationships, books, book_awards),
+        (club_book_relationships, club_period_books),
+    ]
+    run_write_jobs(neo4j_driver, relationship_jobs, max_workers=1)
+
+    # Cleanup
+    cleanup_nodes(neo4j_driver, cleanup_dict)
+
+    neo4j_driver.close()
+
+    # Update sync log
+    update_sync_log(sync_log, timestamp, SYNC_FILE)
+    logger.success("Incremental sync completed successfully.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,105 +1,220 @@
 """Loads transformed JSON collections into MongoDB"""
 
 # Import modules
-import json
+import re
+import queue
+import threading
 from datetime import datetime
+from functools import lru_cache
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import batched
 from pathlib import Path
+import ijson
 from bson import ObjectId
 from loguru import logger
-from pymongo import UpdateOne
+from pymongo import UpdateOne, WriteConcern
+from pymongo.errors import BulkWriteError
 from src.config import TRANSFORMED_COLLECTIONS_DIR
 from src.db.utils.connectors import connect_mongodb
 from src.db.utils.parsers import to_datetime
+from src.db.utils.transforms import CONTENT_HASH_FIELD, content_hash, run_stamped_fields
 from src.db.etl.transforms.cleanup import collections_to_modify
 
-# Connect to MongoDB
-db, client = connect_mongodb()
-
 # Collections that use custom string-based _id fields
-collections_to_modify["user_roles"] = ""
-custom_id_collections = list(collections_to_modify.keys())
+custom_id_collections = frozenset(collections_to_modify) | {"user_roles"}
 
 # Collections with ObjectIds in other fields
 objectid_registry = {
-    "books": ["series._id", "author._id", "contributors._id", "awards._id"],
-    "book_versions": ["book_id", "publisher._id"],
-    "club_members": ["club_id", "user_id"],
-    "club_member_reads": ["club_id", "book_id", "user_id", "period_id"],
-    "club_discussions": ["club_id", "comments.user_id", "created_by", "book_reference"],
-    "club_events": ["created_by"],
-    "club_reading_periods": ["club_id", "created_by"],
-    "club_period_books": ["club_id", "book_id", "period_id", "votes.user_id"],
-    "user_reads": ["book_id", "user_id", "version_id"],
-    "clubs": ["created_by", "moderators", "badges._id"],
-    "users": ["user_badges._id"],
+    "books": frozenset({"series._id", "author._id", "contributors._id", "awards._id"}),
+    "book_versions": frozenset({"book_id", "publisher._id"}),
+    "club_members": frozenset({"club_id", "user_id"}),
+    "club_member_reads": frozenset({"club_id", "book_id", "user_id", "period_id"}),
+    "club_discussions": frozenset({"club_id", "comments.user_id", "created_by", "book_reference"}),
+    "club_events": frozenset({"created_by"}),
+    "club_reading_periods": frozenset({"club_id", "created_by"}),
+    "club_period_books": frozenset({"club_id", "book_id", "period_id", "votes.user_id"}),
+    "user_reads": frozenset({"book_id", "user_id", "version_id"}),
+    "clubs": frozenset({"created_by", "moderators", "badges._id"}),
+    "users": frozenset({"user_badges._id"}),
+}
+
+# Same paths as key tuples, so the walk extends a tuple instead of joining strings
+objectid_paths = {
+    name: frozenset(tuple(p.split(".")) for p in paths)
+    for name, paths in objectid_registry.items()
 }
 
 timestamp = datetime.now()
 
-def convert_fields(obj, collection_name: str, path=""):
+# Docs parsed, converted and written per bulk_write
+LOAD_BATCH_SIZE = 1000
+# Parsed batches allowed to wait for the writer thread
+WRITE_QUEUE_SIZE = 4
+
+# Bulk load acknowledges on the primary without waiting for the journal or replicas;
+# the source JSON is kept, so a lost batch is simply rewritten by the next load
+LOAD_WRITE_CONCERN = WriteConcern(w=1, j=False)
+
+# Field name tags that mark a datetime field
+DATE_KEY_RE = re.compile(r"date|timestamp|created_at", re.IGNORECASE)
+
+
+@lru_cache(maxsize=None)
+def field_kind(collection_name: str, full_path: tuple) -> str:
+    """
+    Classifies a field once per (collection, path) as 'id', 'datetime', 'objectid' or 'nested'.
     """
-    Recursively converts:
+    if full_path == ("_id",) and collection_name not in custom_id_collections:
+        return "id"
+    if DATE_KEY_RE.search(full_path[-1]):
+        return "datetime"
+    if full_path in objectid_paths.get(collection_name, frozenset()):
+        return "objectid"
+    return "nested"
+
+
+def to_object_id(value):
+    """Converts a hex string to ObjectId, returning anything else (None, ObjectIds) unchanged."""
+    if isinstance(value, str) and ObjectId.is_valid(value):
+        return ObjectId(value)
+    return value
+
+
+def convert_fields(obj, collection_name: str, path=()):
+    """
+    Converts in place (and returns obj), walking nested dicts/lists with an explicit stack:
     - _id fields to ObjectId unless collection_name is in custom_id_collections
     - Fields listed in objectid_registry[collection_name] to ObjectId
     - Any field with 'date', 'timestamp', or 'created_at' in its name to datetime
     """
-    if isinstance(obj, dict):
-        new_obj = {}
-        for key, value in obj.items():
-            full_path = f"{path}.{key}" if path else key
-
-            if key == "_id" and path == "" and collection_name not in custom_id_collections:
-                try:
-                    new_obj["_id"] = ObjectId(value)
-                except (TypeError, ValueError):
-                    new_obj["_id"] = value
-            elif any(tag in key.lower() for tag in ["date", "timestamp", "created_at"]):
-                new_obj[key] = to_datetime(value)
-            elif full_path in objectid_registry.get(collection_name, []):
-                if isinstance(value, list):
-                    new_obj[key] = [ObjectId(v) if isinstance(v, str) else v for v in value]
-                else:
-                    try:
-                        new_obj[key] = ObjectId(value)
-                    except (TypeError, ValueError):
-                        new_obj[key] = value
+    # Each entry is (container, key tuple of the container)
+    stack = [(obj, path)]
+    while stack:
+        container, base = stack.pop()
+
+        if isinstance(container, list):
+            stack.extend((item, base) for item in container if isinstance(item, (dict, list)))
+            continue
+        if not isinstance(container, dict):
+            continue
+
+        # Only existing keys are reassigned, so iterating while updating is safe
+        for key, value in container.items():
+            full_path = base + (key,)
+            kind = field_kind(collection_name, full_path)
+
+            if kind == "nested":
+                if isinstance(value, (dict, list)):
+                    stack.append((value, full_path))
+            elif kind == "datetime":
+                container[key] = to_datetime(value)
+            elif kind == "objectid" and isinstance(value, list):
+                container[key] = list(map(to_object_id, value))
             else:
-                new_obj[key] = convert_fields(value, collection_name, full_path)
-        return new_obj
-
-    if isinstance(obj, list):
-        return [convert_fields(item, collection_name, path) for item in obj]
+                container[key] = to_object_id(value)
 
     return obj
 
-def load_single_collection(file_path):
+
+def write_batches(collection, batches: queue.Queue, counts: dict):
+    """
+    Consumes UpdateOne batches from the queue and bulk-writes them until a None sentinel.
+    Keeps draining after any failed batch (counting its ops as failed),
+    so the producer never blocks on a full queue.
+    """
+    while (ops := batches.get()) is not None:
+        try:
+            result = collection.bulk_write(ops, ordered=False)
+            counts["upserted"] += result.upserted_count
+            counts["modified"] += result.modified_count
+        except BulkWriteError as e:
+            # Unordered: the rest of the batch was still applied, so keep going
+            details = e.details
+            counts["upserted"] += details.get("nUpserted", 0)
+            counts["modified"] += details.get("nModified", 0)
+            errors = details.get("writeErrors", [])
+            logger.warning(
+                f"{collection.name}: {len(errors)} writes failed in batch; "
+                f"first error: {errors[0].get('errmsg') if errors else e}"
+            )
+        except Exception as e: # pylint: disable=broad-exception-caught
+            # Any error (PyMongoError, bson InvalidDocument, OverflowError for ints beyond
+            # int64, ...) must not kill the writer, or the producer blocks on the full queue
+            counts["failed"] += len(ops)
+            logger.error(f"{collection.name}: batch of {len(ops)} writes failed: {e}")
+
+
+def load_single_collection(db, file_path):
     """
     Load single transformed collection into MongoDB,
     converting _id and datetime fields appropriately.
     """
     collection_name = file_path.stem
+    collection = db.get_collection(collection_name, write_concern=LOAD_WRITE_CONCERN)
+    stamped_fields = run_stamped_fields.get(collection_name, ())
+    counts = {"upserted": 0, "modified": 0, "failed": 0}
+    unchanged = 0
     try:
-        with file_path.open(encoding="utf-8") as f:
-            raw_docs = json.load(f)
-
-        cleaned_docs = [convert_fields(doc, collection_name) for doc in raw_docs]
-        cleaned_docs = [{**doc, "updated_at": timestamp} for doc in cleaned_docs] # type: ignore
-        collection = db[collection_name]
-
-        ops = [
-            UpdateOne({"_id": doc["_id"]}, {"$set": doc}, upsert=True) # type: ignore
-            for doc in cleaned_docs
-        ]
-
-        if ops:
-            result = collection.bulk_write(ops, ordered=False)
-            logger.success(
-                f"{collection_name}: {result.upserted_count} added, "
-                f"{result.modified_count} updated."
-            )
-
-    except (KeyError, TypeError, ValueError, FileNotFoundError) as e:
+        # Hashes of what was loaded last time; unchanged docs keep their updated_at.
+        # Docs are compared with the hash from their last load, not their current contents,
+        # so an edit made through the admin API is only overwritten once the doc's source
+        # changes; until then the skip leaves the edited doc as it is.
+        stored_hashes = {
+            doc["_id"]: doc.get(CONTENT_HASH_FIELD)
+            for doc in collection.find({}, {CONTENT_HASH_FIELD: 1})
+        }
+
+        # Parse and convert here while a writer thread sends the previous batches;
+        # the bounded queue caps how far parsing can run ahead of the inserts
+        write_queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        writer = threading.Thread(
+            target=write_batches, args=(collection, write_queue, counts), daemon=True
+        )
+        writer.start()
+        try:
+            # Stream the array so only a few batches of docs are held in memory at a time
+            with file_path.open("rb") as f:
+                for chunk in batched(ijson.items(f, "item", use_float=True), LOAD_BATCH_SIZE):
+                    ops = []
+                    for raw_doc in chunk:
+                        # Transforms with fields that differ every run (users) hash their
+                        # docs themselves; otherwise hash before converting, which is in place
+                        doc_hash = (raw_doc.pop(CONTENT_HASH_FIELD, None)
+                                    or content_hash(raw_doc, stamped_fields))
+                        doc = convert_fields(raw_doc, collection_name)
+                        if stored_hashes.get(doc["_id"]) == doc_hash: # type: ignore
+                            unchanged += 1
+                            continue
+
+                        doc[CONTENT_HASH_FIELD] = doc_hash # type: ignore
+                        doc["updated_at"] = timestamp # type: ignore
+                        update = {"$set": doc}
+                        on_insert = {
+                            k: doc.pop(k) for k in stamped_fields if k in doc # type: ignore
+                        }
+                        if on_insert:
+                            update["$setOnInsert"] = on_insert
+                        ops.append(UpdateOne(
+                            {"_id": doc["_id"]}, update, upsert=True # type: ignore
+                        ))
+
+                    if ops:
+                        write_queue.put(ops)
+        finally:
+            # Let the writer finish what's queued, even if parsing failed
+            write_queue.put(None)
+            writer.join()
+
+        summary = (
+            f"{collection_name}: {counts['upserted']} added, {counts['modified']} updated, "
+            f"{unchanged} unchanged"
+        )
+        if counts["failed"]:
+            logger.error(f"{summary}, {counts['failed']} failed to write.")
+        else:
+            logger.success(f"{summary}.")
+
+    except (KeyError, TypeError, ValueError, FileNotFoundError, ijson.JSONError) as e:
         logger.error(f"Failed to load '{collection_name}': {e}")
 
 def load_collections():
@@ -107,17 +222,21 @@ def load_collections():
     directory = Path(TRANSFORMED_COLLECTIONS_DIR)
     json_files = list(directory.glob("*.json"))
 
+    # Connect to MongoDB
+    db, _ = connect_mongodb()
+
     with ThreadPoolExecutor(max_workers=8) as executor:
-        futures = [executor.submit(load_single_collection, fp) for fp in json_files]
+        futures = [executor.submit(load_single_collection, db, fp) for fp in json_files]
 
         for future in as_completed(futures):
             future.result()  # triggers exceptions if any
 
-    client.close()
-    logger.info("MongoDB connection closed.")
 
+def main():
+    """Load all transformed collections into MongoDB."""
+    load_collections()
 
 
 # Run
 if __name__ == "__main__":
-    load_collections()
+    main()
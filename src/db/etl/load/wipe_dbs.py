@@ -7,12 +7,12 @@ from src.db.utils.polyglot import clear_all_nodes
 from src.db.utils.db_ops import drop_all_collections
 
 
-# Connect to databases
-db, client = connect_mongodb()
-neo4j_driver = connect_auradb()
-
 def main(wipe: str="all"):
     """Choose which database to wipe"""
+    # Connect only to the databases being wiped
+    db = connect_mongodb()[0] if wipe != "aura" else None
+    neo4j_driver = connect_auradb() if wipe != "mongo" else None
+
     if wipe == "mongo":
         logger.warning("Dropping all collections in MongoDB...")
         drop_all_collections(db)
@@ -2,11 +2,12 @@
 
 # Imports
 import os
-import json
 from loguru import logger
 from bson.objectid import ObjectId
 from src.config import RAW_COLLECTIONS_DIR, TRANSFORMED_COLLECTIONS_DIR
-from src.db.utils.transforms import remove_custom_ids, change_id_field, add_timestamp
+from src.db.utils.transforms import (remove_custom_ids, change_id_field, add_timestamp,
+                                    collections_to_timestamp)
+from src.db.utils.files import write_json
 
 
 # Collections to remove custom ids from
@@ -35,21 +36,19 @@ collections_to_modify = {
     "countries": "country_id"
 }
 
-collections_to_timestamp = [
-    "genres", "club_event_types", "club_event_statuses",
-    "user_permissions", "publishers", "tags", "awards"
-]
+def main():
+    """Remove custom ids, swap id fields and add timestamps."""
+    # Create deletions JSON
+    deletions = [{"_id": str(ObjectId()), "data": "placeholder"}]
+    write_json(os.path.join(TRANSFORMED_COLLECTIONS_DIR, "deletions.json"), deletions)
 
-# Create deletions JSON
-deletions = [{"_id": str(ObjectId()), "data": "placeholder"}]
-deletions_path = os.path.join(TRANSFORMED_COLLECTIONS_DIR, "deletions.json")
-with open(deletions_path, "w", encoding="utf-8") as f:
-    json.dump(deletions, f, ensure_ascii=False, indent=2)
-
-if __name__ == "__main__":
     remove_custom_ids(raw_collections_to_cleanup, RAW_COLLECTIONS_DIR)
     remove_custom_ids(transformed_collections_to_cleanup, TRANSFORMED_COLLECTIONS_DIR)
     change_id_field(collections_to_modify, RAW_COLLECTIONS_DIR)
     for collection in collections_to_timestamp:
         add_timestamp(collection)
     logger.info("Cleaned collections.")
+
+
+if __name__ == "__main__":
+    main()
@@ -22,6 +22,12 @@ def transform_awards_func(doc):
         "year_ended": to_int(doc.get("year_ended"))
     }
 
+
 # Run transformation
-if __name__ == "__main__":
+def main():
+    """Transform awards."""
     transform_collection("awards", transform_awards_func)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,16 @@
 
 # Imports
 import re
-import json
-from src.db.utils.transforms import transform_collection
+from collections import defaultdict
+from functools import partial
+from src.db.utils.transforms import transform_collections
 from src.db.utils.parsers import to_int, to_float, to_array, make_subdocuments
-from src.db.utils.lookups import (load_lookup_data, resolve_lookup, resolve_creator,
+from src.db.utils.lookups import (load_lookup_data, resolve_creator,
                                   resolve_awards)
 from src.db.utils.derived_fields import generate_image_url
+from src.db.utils.files import read_json
 from src.db.utils.connectors import connect_azure_blob
-from src.config import RAW_COLLECTIONS_DIR
+from src.config import RAW_COLLECTIONS_DIR, transform_workers
 
 # Blob Service Client
 blobserviceclient_account_name = connect_azure_blob().account_name
@@ -25,22 +27,29 @@ lookup_registry = {
 
 lookup_data = load_lookup_data(lookup_registry)
 
+# Bind lookup getters once
+resolve_series = lookup_data["book_series"].get
+resolve_book = lookup_data["books"].get
+resolve_publisher = lookup_data["publishers"].get
 
-# Subdoc registry
+
+# Subdoc registry (make_subdocuments strips entries, so transforms are bound once here)
 subdoc_registry = {
     'creators': {
         'pattern': None,
-        'transform': lambda name: resolve_creator(name.strip(), lookup_data)
+        'transform': partial(resolve_creator, lookup_data=lookup_data)
     },
     'awards': {
+        # Name and category are unrolled possessively up to the next field label,
+        # so they may contain ';' without lazy backtracking
         'pattern': re.compile(
             r"award_id:\s*(\w+);\s*"
-            r"award_name:\s*(.*?);\s*"
-            r"award_category:\s*(.*?);\s*"
+            r"award_name:\s*([^;]*+(?:;(?!\s*award_category:)[^;]*+)*+);\s*"
+            r"award_category:\s*([^;]*+(?:;(?!\s*year:)[^;]*+)*+);\s*"
             r"year:\s*(\d{4});\s*"
             r"award_status:\s*(\w+)"
         ),
-        'transform': lambda match: resolve_awards(match, lookup_data)
+        'transform': partial(resolve_awards, lookup_data=lookup_data)
     }
 }
 
@@ -55,7 +64,7 @@ def transform_books_func(doc):
         "title": doc.get("title"),
         "author": make_subdocuments(doc.get("author"), "creators", subdoc_registry, separator=','),
         "genre": to_array(doc.get("genre")),
-        "series": resolve_lookup('book_series', doc.get("series"), lookup_data),
+        "series": resolve_series(doc.get("series")),
         "series_index": to_int(doc.get("series_index")),
         "description": doc.get("description"),
         "first_publication_date": doc.get("first_publication_date"),
@@ -72,7 +81,7 @@ def transform_book_versions_func(doc):
     return{
         "_id": doc.get("_id"),
         "version_id": doc.get("version_id"),
-        "book_id": resolve_lookup('books', doc.get("book_id"), lookup_data),
+        "book_id": resolve_book(doc.get("book_id")),
         "title": doc.get("title"),
         "isbn_13": to_int(doc.get("isbn_13")),
         "asin": doc.get("asin"),
@@ -82,7 +91,7 @@ def transform_book_versions_func(doc):
         "page_count": to_int(doc.get("page_count")),
         "length_hours": to_float(doc.get("length")),
         "description": doc.get("description"),
-        "publisher": resolve_lookup('publishers', doc.get("publisher"), lookup_data),
+        "publisher": resolve_publisher(doc.get("publisher")),
         "language": doc.get("language"),
         "translator": make_subdocuments(doc.get("translator"), "creators", subdoc_registry, ','),
         "narrator": make_subdocuments(doc.get("narrator"), "creators", subdoc_registry, ','),
@@ -94,15 +103,19 @@ def transform_book_versions_func(doc):
         "date_added": doc.get("date_added")
     }
 
-with open(RAW_COLLECTIONS_DIR / "books.json", "r", encoding="utf-8") as f:
-    books = json.load(f)
+books = read_json(RAW_COLLECTIONS_DIR / "books.json")
+
+# Group books by series name once, instead of scanning all books per series
+books_by_series = defaultdict(list)
+for book in books:
+    books_by_series[book.get("series")].append(book)
 
 def transform_book_series_func(doc):
     """
     Transforms a book_series document to the desired structure.
     """
-    filtered_books = [b for b in books if b["series"] == doc.get("name")]
-    filtered_books.sort(key=lambda b: b["series_index"])
+    filtered_books = sorted(books_by_series.get(doc.get("name"), []),
+                            key=lambda b: b["series_index"])
     selected = [{"index": to_int(b["series_index"]), "_id": b["_id"]} for b in filtered_books]
 
     return{
@@ -112,7 +125,15 @@ def transform_book_series_func(doc):
         "date_added": doc.get("date_added")
     }
 
+
+def main():
+    """Transform book collections."""
+    transform_collections([
+        ("books", transform_books_func),
+        ("book_versions", transform_book_versions_func),
+        ("book_series", transform_book_series_func),
+    ], workers=transform_workers)
+
+
 if __name__ == "__main__":
-    transform_collection("books", transform_books_func)
-    transform_collection("book_versions", transform_book_versions_func)
-    transform_collection("book_series", transform_book_series_func)
+    main()
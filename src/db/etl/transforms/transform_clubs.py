@@ -2,10 +2,14 @@
 
 # Imports
 import re
-from datetime import datetime
 from src.db.utils.parsers import to_int, to_array, make_subdocuments
-from src.db.utils.transforms import transform_collection
-from src.db.utils.lookups import load_lookup_data, resolve_lookup
+from src.db.utils.transforms import transform_collections
+from src.db.utils.lookups import load_lookup_data
+from src.config import transform_workers
+
+
+# Sheet checkbox values that mean True
+truthy_values = frozenset({"TRUE"})
 
 # Define lookup registry
 lookup_registry = {
@@ -20,40 +24,56 @@ lookup_registry = {
 # Load lookup data
 lookup_data = load_lookup_data(lookup_registry)
 
+# Bind lookup getters once
+resolve_club = lookup_data["clubs"].get
+resolve_user = lookup_data["users"].get
+resolve_book = lookup_data["books"].get
+resolve_period = lookup_data["club_reading_periods"].get
+resolve_genre = lookup_data["genres"].get
+resolve_club_badge = lookup_data["club_badges"].get
+
 # Subdoc registry
 subdoc_registry = {
     "votes": {
         "pattern": re.compile(r"user_id:\s*(\w+),\s*vote_date:\s*(\d{4}-\d{2}-\d{2})"),
         "transform": lambda match: {
-            "user_id": lookup_data["users"].get(match.group(1)),
+            "user_id": resolve_user(match.group(1)),
             "timestamp": match.group(2)
         }
     },
     "club_discussions": {
+        # Comment is unrolled as "runs of non-';', then ';' not starting the timestamp"
+        # so it matches in one pass without lazy backtracking, and may still contain ';';
+        # the leading unit requires at least one character, so empty comments are rejected
         "pattern": re.compile(
-            r"user_id:\s*(\w+);\s*comment:\s*(.+?);\s*timestamp:\s*(\d{4}-\d{2}-\d{2} \d{2}:\d{2})"
+            r"user_id:\s*(\w+);\s*"
+            r"comment:\s*((?:[^;]|;(?!\s*timestamp:))[^;]*(?:;(?!\s*timestamp:)[^;]*)*);\s*"
+            r"timestamp:\s*(\d{4}-\d{2}-\d{2} \d{2}:\d{2})"
         ),
         "transform": lambda match: {
-            "user_id": lookup_data["users"].get(match.group(1)),
+            "user_id": resolve_user(match.group(1)),
             "comment": match.group(2).strip(),
             "timestamp": match.group(3)
         }
     },
     "club_genres": {
         "pattern": None,
-        "transform": lambda genre_name: lookup_data["genres"].get(genre_name.strip())
+        "transform": resolve_genre
     },
     "join_requests": {
         "pattern": re.compile(r"user_id:\s*(\w+),\s*timestamp:\s*(\d{4}-\d{2}-\d{2})"),
         "transform": lambda match: {
-            "user_id": lookup_data["users"].get(match.group(1)),
+            "user_id": resolve_user(match.group(1)),
             "timestamp": match.group(2)
         }
     },
     'badges': {
-        'pattern': re.compile(r'badge:\s*(.+?),\s*timestamp:\s*(\d{4}-\d{2}-\d{2})'),
+        'pattern': re.compile(
+            r'badge:\s*((?:[^,]|,(?!\s*timestamp:))[^,]*(?:,(?!\s*timestamp:)[^,]*)*),\s*'
+            r'timestamp:\s*(\d{4}-\d{2}-\d{2})'
+        ),
         'transform': lambda match: {
-            **resolve_lookup('club_badges', match.group(1), lookup_data), # type: ignore
+            **resolve_club_badge(match.group(1)), # type: ignore
             "timestamp": match.group(2)
         }
     },
@@ -66,11 +86,11 @@ def transform_club_members_func(doc):
     """
     return {
         "_id": doc.get("_id"),
-        "club_id": lookup_data["clubs"].get(doc.get("club_id")),
-        "user_id": lookup_data["users"].get(doc.get("user_id")),
+        "club_id": resolve_club(doc.get("club_id")),
+        "user_id": resolve_user(doc.get("user_id")),
         "role": doc.get("role"),
         "date_joined": doc.get("date_joined"),
-        "is_active": doc.get("is_active") == "TRUE",
+        "is_active": doc.get("is_active") in truthy_values,
     }
 
 def transform_club_member_reads_func(doc):
@@ -79,12 +99,11 @@ def transform_club_member_reads_func(doc):
     """
     return {
         "_id": doc.get("_id"),
-        "club_id": lookup_data["clubs"].get(doc.get("club_id")),
-        "user_id": lookup_data["users"].get(doc.get("user_id")),
-        "book_id": lookup_data["books"].get(doc.get("book_id")),
-        "period_id": lookup_data["club_reading_periods"].get(doc.get("period_id")),
-        "read_date": doc.get("read_date"),
-        "timestamp": str(datetime.now())
+        "club_id": resolve_club(doc.get("club_id")),
+        "user_id": resolve_user(doc.get("user_id")),
+        "book_id": resolve_book(doc.get("book_id")),
+        "period_id": resolve_period(doc.get("period_id")),
+        "read_date": doc.get("read_date")
     }
 
 def transform_club_period_books_func(doc):
@@ -93,18 +112,17 @@ def transform_club_period_books_func(doc):
     """
     return {
         "_id": doc.get("_id"),
-        "club_id": lookup_data["clubs"].get(doc.get("club_id")),
-        "book_id": lookup_data["books"].get(doc.get("book_id")),
-        "period_id": lookup_data["club_reading_periods"].get(doc.get("period_id")),
+        "club_id": resolve_club(doc.get("club_id")),
+        "book_id": resolve_book(doc.get("book_id")),
+        "period_id": resolve_period(doc.get("period_id")),
         "period_startdate": doc.get("period_startdate"),
         "period_enddate": doc.get("period_enddate"),
-        "selected_by": lookup_data["users"].get(doc.get("user_id")),
+        "selected_by": resolve_user(doc.get("user_id")),
         "selection_method": doc.get("selection_method"),
         "votes": make_subdocuments(doc.get("votes"), "votes", subdoc_registry, separator=";"),
         "votes_startdate": doc.get("votes_startdate"),
         "votes_enddate": doc.get("votes_enddate"),
-        "selection_status": doc.get("selection_status"),
-        "date_added": str(datetime.now())
+        "selection_status": doc.get("selection_status")
     }
 
 def transform_club_discussions_func(doc):
@@ -113,14 +131,14 @@ def transform_club_discussions_func(doc):
     """
     return {
         "_id": doc.get("_id"),
-        "club_id": lookup_data["clubs"].get(doc.get("club_id")),
+        "club_id": resolve_club(doc.get("club_id")),
         "topic_name": doc.get("topic_name"),
         "topic_description": doc.get("topic_description"),
-        "created_by": lookup_data["users"].get(doc.get("created_by")),
+        "created_by": resolve_user(doc.get("created_by")),
         "timestamp": doc.get("timestamp"),
         "comments": make_subdocuments(doc.get("comments"), "club_discussions",
                                       subdoc_registry, separator="|"),
-        "book_reference": lookup_data["books"].get(doc.get("book_reference"))
+        "book_reference": resolve_book(doc.get("book_reference"))
     }
 
 def transform_club_events_func(doc):
@@ -129,15 +147,14 @@ def transform_club_events_func(doc):
     """
     return {
         "_id": doc.get("_id"),
-        "club_id": lookup_data["clubs"].get(doc.get("club_id")),
+        "club_id": resolve_club(doc.get("club_id")),
         "name": doc.get("name"),
         "description": doc.get("description"),
         "type": doc.get("type"),
         "startdate": doc.get("startdate"),
         "enddate": doc.get("enddate"),
         "status": doc.get("status"),
-        "created_by": lookup_data["users"].get(doc.get("created_by")),
-        "date_added": str(datetime.now())
+        "created_by": resolve_user(doc.get("created_by"))
     }
 
 def transform_club_reading_periods_func(doc):
@@ -146,15 +163,14 @@ def transform_club_reading_periods_func(doc):
     """
     return {
         "_id": doc.get("_id"),
-        "club_id": lookup_data["clubs"].get(doc.get("club_id")),
+        "club_id": resolve_club(doc.get("club_id")),
         "name": doc.get("name"),
         "description": doc.get("description"),
         "startdate": doc.get("startdate"),
         "enddate": doc.get("enddate"),
         "status": doc.get("status"),
         "max_books": to_int(doc.get("max_books")),
-        "created_by": lookup_data["users"].get(doc.get("created_by")),
-        "date_added": str(datetime.now())
+        "created_by": resolve_user(doc.get("created_by"))
     }
 
 def transform_club_badges_func(doc):
@@ -164,8 +180,7 @@ def transform_club_badges_func(doc):
     return {
         "_id": doc.get("_id"),
         "name": doc.get("name"),
-        "description": doc.get("description"),
-        "date_added": str(datetime.now())
+        "description": doc.get("description")
     }
 
 def transform_clubs_func(doc):
@@ -181,22 +196,28 @@ def transform_clubs_func(doc):
         "description": doc.get("description"),
         "visibility": doc.get("visibility"),
         "rules": doc.get("rules"),
-        "moderators": [lookup_data["users"].get(user) for user
-                            in to_array(doc.get("moderators"))],
+        "moderators": list(map(resolve_user, to_array(doc.get("moderators")))),
         "badges": make_subdocuments(doc.get("badges"), 'badges', subdoc_registry, separator='|'),
         "member_permissions": to_array(doc.get("member_permissions")),
         "join_requests": make_subdocuments(doc.get("join_requests"), "join_requests",
                                            subdoc_registry, separator=";"),
-        "created_by": lookup_data["users"].get(doc.get("created_by")),
+        "created_by": resolve_user(doc.get("created_by")),
     }
 
+
 # Run all transformations
+def main():
+    """Transform club collections."""
+    transform_collections([
+        ("club_members", transform_club_members_func),
+        ("club_member_reads", transform_club_member_reads_func),
+        ("club_period_books", transform_club_period_books_func),
+        ("club_discussions", transform_club_discussions_func),
+        ("club_events", transform_club_events_func),
+        ("club_reading_periods", transform_club_reading_periods_func),
+        ("club_badges", transform_club_badges_func),
+        ("clubs", transform_clubs_func),
+    ], workers=transform_workers)
+
 if __name__ == "__main__":
-    transform_collection("club_members", transform_club_members_func)
-    transform_collection("club_member_reads", transform_club_member_reads_func)
-    transform_collection("club_period_books", transform_club_period_books_func)
-    transform_collection("club_discussions", transform_club_discussions_func)
-    transform_collection("club_events", transform_club_events_func)
-    transform_collection("club_reading_periods", transform_club_reading_periods_func)
-    transform_collection("club_badges", transform_club_badges_func)
-    transform_collection("clubs", transform_clubs_func)
+    main()
@@ -1,7 +1,6 @@
 """Transform creators"""
 
 # Imports
-from datetime import datetime
 from src.db.utils.parsers import to_array
 from src.db.utils.transforms import transform_collection
 
@@ -18,10 +17,15 @@ def transform_creators_func(doc):
         "lastname": doc.get("lastname"),
         "bio": doc.get("bio"),
         "website": doc.get("website"),
-        "roles": to_array(doc.get("roles")),
-        "date_added": str(datetime.now())
+        "roles": to_array(doc.get("roles"))
     }
 
+
 # Run transformation
-if __name__ == "__main__":
+def main():
+    """Transform creators."""
     transform_collection("creators", transform_creators_func)
+
+
+if __name__ == "__main__":
+    main()
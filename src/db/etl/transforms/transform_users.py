@@ -2,13 +2,13 @@
 
 # Import modules
 import re
-import json
-from datetime import datetime
-from src.db.utils.transforms import transform_collection, add_read_details
+from src.db.utils.transforms import (transform_collection, add_read_details, content_hash,
+                                    CONTENT_HASH_FIELD)
 from src.db.utils.parsers import to_int, make_subdocuments, to_array
-from src.db.utils.lookups import resolve_lookup, load_lookup_data
-from src.db.utils.security import encrypt_pii, hash_password, latest_key_version
-from src.config import RAW_COLLECTIONS_DIR
+from src.db.utils.lookups import load_lookup_data
+from src.db.utils.files import read_json
+from src.db.utils.security import encrypt_pii, fingerprint, hash_password, latest_key_version
+from src.config import RAW_COLLECTIONS_DIR, transform_workers
 
 
 # Define field lookups
@@ -23,11 +23,19 @@ lookup_registry = {
 
 lookup_data = load_lookup_data(lookup_registry)
 
+# Bind lookup getters once
+resolve_version = lookup_data["book_versions"].get
+resolve_genre = lookup_data["genres"].get
+resolve_user = lookup_data["users"].get
+resolve_user_badge = lookup_data["user_badges"].get
+resolve_rstatus = lookup_data["read_statuses"].get
+resolve_club = lookup_data["clubs"].get
+
 subdoc_registry = {
     'reading_log': {
-        'pattern': re.compile(r'(.+):\s*(\d{4}-\d{2}-\d{2}(?: \d{2}:\d{2}:\d{2})?)'),
+        'pattern': re.compile(r'([^:]+):\s*(\d{4}-\d{2}-\d{2}(?: \d{2}:\d{2}:\d{2})?)'),
         'transform': lambda match: {
-            "rstatus": resolve_lookup('read_statuses', match.group(1), lookup_data),
+            "rstatus": resolve_rstatus(match.group(1)),
             "timestamp": match.group(2)
         }
     },
@@ -39,28 +47,30 @@ subdoc_registry = {
         }
     },
     'badges': {
-        'pattern': re.compile(r'badge:\s*(.+?),\s*timestamp:\s*(\d{4}-\d{2}-\d{2})'),
+        'pattern': re.compile(
+            r'badge:\s*((?:[^,]|,(?!\s*timestamp:))[^,]*(?:,(?!\s*timestamp:)[^,]*)*),\s*'
+            r'timestamp:\s*(\d{4}-\d{2}-\d{2})'
+        ),
         'transform': lambda match: {
-            **resolve_lookup('user_badges', match.group(1), lookup_data), # type: ignore
+            **resolve_user_badge(match.group(1)), # type: ignore
             "timestamp": match.group(2)
         }
     },
     'preferred_genres': {
         'pattern': None,
-        'transform': lambda genre_name: resolve_lookup('genres', genre_name, lookup_data)
+        'transform': resolve_genre
     },
     "clubs": {
         "pattern": re.compile(r"_id:\s*(\w+),\s*role:\s*(\w+),\s*joined:\s*(\d{4}-\d{2}-\d{2})"),
         "transform": lambda match: {
-            "_id": lookup_data["clubs"].get(match.group(1)),
+            "_id": resolve_club(match.group(1)),
             "role": match.group(2)
         }
     }
 }
 
 # Load book_versions
-with open(RAW_COLLECTIONS_DIR / "book_versions.json", "r", encoding="utf-8") as f:
-    book_versions = json.load(f)
+book_versions = read_json(RAW_COLLECTIONS_DIR / "book_versions.json")
 
 def transform_user_reads_func(doc):
     """
@@ -72,9 +82,9 @@ def transform_user_reads_func(doc):
 
     transformed_doc = {
         "_id": doc.get("_id"),
-        "user_id": resolve_lookup('users', doc.get("user_id"), lookup_data),
-        "version_id": resolve_lookup('book_versions', doc.get("version_id"), lookup_data),
-        "rstatus": resolve_lookup('read_statuses', doc.get("rstatus_id"), lookup_data),
+        "user_id": resolve_user(doc.get("user_id")),
+        "version_id": resolve_version(doc.get("version_id")),
+        "rstatus": resolve_rstatus(doc.get("rstatus_id")),
         "reading_log": make_subdocuments(doc.get("reading_log"), 'reading_log',
                                              subdoc_registry, separator=','),
         "date_started": doc.get("date_started"),
@@ -96,8 +106,7 @@ def transform_user_roles_func(doc):
         "_id": doc.get("role_id"),
         "name": doc.get("name"),
         "permissions": to_array(doc.get("permissions")),
-        "description": doc.get("description"),
-        "date_added": str(datetime.now())
+        "description": doc.get("description")
     }
 
 def transform_user_badges_func(doc):
@@ -107,14 +116,19 @@ def transform_user_badges_func(doc):
     return {
         "_id": doc.get("_id"),
         "name": doc.get("name"),
-        "description": doc.get("description"),
-        "date_added": str(datetime.now())
+        "description": doc.get("description")
     }
 
 
+# Fields re-salted (password) or re-encrypted with a fresh IV on every run
+salted_fields = ("email_address", "password", "dob", "gender", "city", "state", "country")
+
+
 def transform_users_func(doc):
     """
     Transforms a user document to the desired structure.
+    Salted fields differ on every run, so the content hash is computed here with
+    fingerprints of their source values in their place, to skip unchanged users on load.
     """
     key_version = latest_key_version
 
@@ -145,12 +159,21 @@ def transform_users_func(doc):
         "is_admin": bool(doc.get("is_admin", False)),
         "key_version": key_version
     }
+    transformed_doc[CONTENT_HASH_FIELD] = content_hash(
+        {**transformed_doc, **{field: fingerprint(doc.get(field)) for field in salted_fields}}
+    )
     return transformed_doc
 
 
 # Transform 'user_reads' collection
-if __name__ == "__main__":
-    transform_collection("user_reads", transform_user_reads_func)
+def main():
+    """Transform user collections."""
+    transform_collection("user_reads", transform_user_reads_func, workers=transform_workers)
     transform_collection("user_roles", transform_user_roles_func)
     transform_collection("user_badges", transform_user_badges_func)
-    transform_collection("users", transform_users_func)
+    # bcrypt-hashing every password is where the pool pays off most; raise TRANSFORM_WORKERS
+    transform_collection("users", transform_users_func, workers=transform_workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,9 +12,14 @@ blob_service_client = connect_azure_blob()
 CONTAINER_NAME = 'cover-art'
 
 
-if __name__ == "__main__":
+def main():
+    """Download cover art and sync it to Azure."""
     download_images("book_versions", "cover_url", "cover", COVER_ART_DIR)
     sync_images(blob_service_client, CONTAINER_NAME, COVER_ART_DIR, 'cover')
     selective_delete(COVER_ART_DIR, "cover")
 
     logger.info("Images downloaded and synced to Azure containers.")
+
+
+if __name__ == "__main__":
+    main()
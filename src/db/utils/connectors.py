@@ -4,8 +4,12 @@
 import os
 import sys
 import json
+import time
+import threading
+from functools import lru_cache
 from typing import Tuple
 import gspread
+from gspread.utils import numericise_all
 from oauth2client.service_account import ServiceAccountCredentials
 from azure.storage.blob import BlobServiceClient
 from azure.core.exceptions import AzureError, ResourceNotFoundError
@@ -18,12 +22,15 @@ from src.config import (ETL_LOGS_DIR, gsheet_cred, mongodb_uri, azure_str,
                         neo4j_uri, neo4j_user, neo4j_pwd)
 
 
+@lru_cache(maxsize=1)
 def connect_mongodb():
     """
     Connects to the MongoDB database and returns the database object.
+    The client is created once per process and shared by every caller, so don't close it.
     """
     try:
-        client = MongoClient(mongodb_uri)
+        client = MongoClient(mongodb_uri, maxPoolSize=64,
+                             compressors="zstd,zlib", zlibCompressionLevel=1)
         db = client["book_club"]
         client.admin.command('ping')
         logger.info("Successfully connected to MongoDB")
@@ -42,7 +49,9 @@ def connect_auradb():
     auth = (neo4j_user, neo4j_pwd)
 
     try:
-        driver = GraphDatabase.driver(uri, auth=auth)
+        driver = GraphDatabase.driver(
+            uri, auth=auth, max_connection_pool_size=32, connection_acquisition_timeout=60
+        )
         with driver.session() as session:
             session.run("RETURN 1")
         logger.info("Successfully connected to AuraDB")
@@ -80,24 +89,110 @@ def make_blob_public(container_client, blob_name):
         logger.error(f"Failed to set blob '{blob_name}' to public: {e}")
 
 
+@lru_cache(maxsize=None)
+def open_spreadsheet(title: str):
+    """
+    Authorizes the service account and opens a spreadsheet, once per process.
+    Failures raise and are not cached.
+    """
+    # Google Sheets authorization
+    scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+    creds = ServiceAccountCredentials.from_json_keyfile_name(gsheet_cred, scope)  # type: ignore
+    client_sheet = gspread.authorize(creds) # type: ignore
+
+    # Open spreadsheet
+    return client_sheet.open(title)
+
+
 def connect_googlesheet():
     """
     Connects to Book Club DB and returns the spreadsheet.
     """
     try:
-        # Google Sheets authorization
-        scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-        creds = ServiceAccountCredentials.from_json_keyfile_name(gsheet_cred, scope)  # type: ignore
-        client_sheet = gspread.authorize(creds) # type: ignore
-
-        # Open spreadsheet
-        spreadsheet = client_sheet.open("Book Club DB")
+        spreadsheet = open_spreadsheet("Book Club DB")
         logger.info("Connected to Google Sheet")
         return spreadsheet
     except gspread.exceptions.APIError as e:
         logger.error(f"APIError for sheet 'Book Club DB': {e}")
 
 
+class RateLimiter:
+    """
+    Thread-safe token bucket allowing `calls` acquisitions per `period` seconds.
+    """
+    def __init__(self, calls: int, period: float):
+        self.capacity = calls
+        self.tokens = float(calls)
+        self.rate = calls / period
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Blocks until a token is available, then consumes it.
+        """
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# Google Sheets allows 60 read requests per minute per user; keep some headroom
+sheets_rate_limiter = RateLimiter(calls=55, period=60)
+
+
+def values_to_records(values: list) -> list:
+    """
+    Converts a header-first 2D values array into records,
+    matching Worksheet.get_all_records() (numericised, short rows padded with "").
+    """
+    if not values:
+        return []
+    headers, *rows = values
+    width = len(headers)
+    return [dict(zip(headers, numericise_all(row + [""] * (width - len(row))))) for row in rows]
+
+
+def fetch_sheet_records(spreadsheet, sheet_names, max_retries: int = 5) -> dict:
+    """
+    Fetches all records from the named worksheets in a single values.batchGet request,
+    throttled to the Google Sheets read quota and retried with backoff when rate limited.
+
+    Returns:
+        Dict of {sheet_name: records}. Empty if the request fails (error is logged).
+    """
+    if not sheet_names:
+        return {}
+
+    ranges = [f"'{name}'" for name in sheet_names]
+    for attempt in range(max_retries + 1):
+        sheets_rate_limiter.acquire()
+        try:
+            response = spreadsheet.values_batch_get(ranges)
+            break
+        except gspread.exceptions.APIError as e:
+            if e.response.status_code == 429 and attempt < max_retries:
+                wait = 2 ** attempt
+                logger.warning(f"Sheets read quota exceeded. Retrying in {wait}s...")
+                time.sleep(wait)
+                continue
+            logger.error(f"APIError for sheets {sheet_names}: {e}")
+            return {}
+
+    # valueRanges come back in request order
+    value_ranges = response.get("valueRanges", [])
+    return {
+        name: values_to_records(value_range.get("values", []))
+        for name, value_range in zip(sheet_names, value_ranges)
+    }
+
+
 def wipe_container(blob_service_client, container_name: str,
                    raise_on_error: bool = True) -> Tuple[bool, int]:
     """
@@ -35,7 +35,6 @@ def archive_delete(db, collection_name, filter_query):
     }
 
 def drop_all_collections(db):
-    """Drop all existing collections"""
-    for name in db.list_collection_names():
-        db.drop_collection(name)
-        logger.info(f"Dropped collection '{name}'")
+    """Drop all existing collections (and their indexes) in one dropDatabase call"""
+    db.client.drop_database(db.name)
+    logger.info(f"Dropped database '{db.name}'")
@@ -9,6 +9,11 @@ from .files import generate_image_filename
 from .parsers import to_datetime
 from .lookups import find_doc
 
+# Run date (at midnight), shared by every document in this run. Day resolution keeps
+# fields derived from it identical across same-day runs, so load_mongo can skip them.
+run_time = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+run_time_str = run_time.strftime("%Y-%m-%d %H:%M:%S")
+
 
 def generate_image_url(doc: dict, url_str: str, img_type: str,
                        container_name: str, account_name) -> str:
@@ -53,7 +58,7 @@ def generate_rlog(doc: dict):
 
     # Set rstatus_history to now if blank and current_rstatus is "Paused"
     if current_rstatus == "rs3" and rstatus_history == "":
-        rstatus_history = f"rs3: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}"
+        rstatus_history = f"rs3: {run_time_str}"
 
     # Set start and end entries
     start = f"rs2: {doc["date_started"]}" if doc["date_started"] != "" else ""
@@ -61,7 +66,7 @@ def generate_rlog(doc: dict):
 
     # Set start to 7 days before now if blank and current_rstatus is "Paused"
     if start == "" and current_rstatus == "rs3":
-        start_date = datetime.now() - timedelta(days=7)
+        start_date = run_time - timedelta(days=7)
         start = f"rs2: {start_date.strftime("%Y-%m-%d %H:%M:%S")}"
 
     # Set start to 21 days before end if blank and current_rstatus is "Read"/"Paused"/"DNF"
@@ -105,7 +110,7 @@ def compute_d2r(doc):
 
     # Add "Read" as last token if last_status is "Reading"
     if last_status == "rs2":
-        new_token = f"rs1: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}"
+        new_token = f"rs1: {run_time_str}"
         tokens.append(new_token)
 
     events = []
@@ -3,8 +3,10 @@
 # Imports
 import os
 import json
+import time
 import shutil
 import hashlib
+import orjson
 from datetime import datetime
 from urllib.parse import urlparse
 from loguru import logger
@@ -31,6 +33,37 @@ def wipe_directory(directory):
         exit()
 
 
+def read_json(path):
+    """
+    Reads a JSON file with orjson.
+    """
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+
+def write_json(path, data):
+    """
+    Writes data to a compact (unindented) JSON file with orjson.
+    Writes to a temp file first and swaps it in, so readers never see a torn file.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(orjson.dumps(data))
+    os.replace(tmp_path, path)
+
+
+def generate_object_ids(count: int) -> list:
+    """
+    Generates count ObjectId hex strings in one go.
+    They share a timestamp and a fresh random 5-byte prefix, with a 3-byte counter
+    standing in for ObjectId's own, so the ids are unique and sort in row order.
+    """
+    if count > 1 << 24:
+        raise ValueError("Cannot generate more than 2**24 ObjectIds per batch")
+    prefix = (int(time.time()).to_bytes(4, "big") + os.urandom(5)).hex()
+    return [f"{prefix}{i:06x}" for i in range(count)]
+
+
 def generate_image_filename(doc: dict, img_type: str):
     """
     Generate a hashed filename for a profile image using a unique field entry.
@@ -76,8 +109,7 @@ def download_images(collection_name, url_field, img_type, output_directory):
     input_path = os.path.join(RAW_COLLECTIONS_DIR, raw_file)
 
     try:
-        with open(input_path, encoding="utf-8") as f:
-            input_file_data = json.load(f)
+        input_file_data = read_json(input_path)
         logger.info(f"Found {len(input_file_data)} entries to process.")
     except (KeyError, json.JSONDecodeError, TypeError, ValueError) as e:
         logger.error(f"Failed to load {raw_file}: {e}")
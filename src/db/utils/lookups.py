@@ -2,12 +2,22 @@
 
 # Import modules
 import os
-import json
+from functools import lru_cache
 from loguru import logger
 from src.config import RAW_COLLECTIONS_DIR
+from .files import read_json
 from .parsers import to_int
 
 
+@lru_cache(maxsize=64)
+def read_collection(path: str, mtime_ns: int) -> list:
+    """
+    Reads a raw collection, shared by every transform module in the process.
+    Keyed on the file's mtime so a rewritten file is read again. Treat the result as read-only.
+    """
+    return read_json(path)
+
+
 # Load lookup collections from disk
 def load_lookup_data(lookup_registry: dict) -> dict:
     """
@@ -18,8 +28,7 @@ def load_lookup_data(lookup_registry: dict) -> dict:
 
     for name, config in lookup_registry.items():
         path = os.path.join(RAW_COLLECTIONS_DIR, f"{name}.json")
-        with open(path, encoding="utf-8") as f:
-            collection = json.load(f)
+        collection = read_collection(path, os.stat(path).st_mtime_ns)
 
         string_field = config["field"]
         get_fields = config["get"]
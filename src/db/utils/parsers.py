@@ -1,7 +1,9 @@
 """Parsing utility functions"""
 
 # Import modules
+import re
 from datetime import datetime
+from functools import lru_cache
 from loguru import logger
 
 
@@ -20,6 +22,39 @@ def clean_document(doc: dict):
     return clean_doc, removed_keys
 
 
+# Zero-padded dates in the sheet formats, which fromisoformat parses exactly like strptime
+ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}(?: \d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?)?")
+
+# Accepted date formats, tried in order for anything ISO_DATE_RE doesn't cover
+date_formats = (
+    '%Y-%m-%d %H:%M:%S.%f',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d %H:%M',
+    '%Y-%m-%d'
+)
+
+
+@lru_cache(maxsize=1 << 16)
+def parse_datetime(date_string: str) -> datetime:
+    """
+    Parses a stripped date string in one of date_formats into a naive datetime.
+    Cached, since the same timestamps recur across docs; invalid strings raise ValueError
+    and are not cached.
+    """
+    # Fast path: fromisoformat (C-implemented) for the common zero-padded shapes only,
+    # so 'T' separators and UTC offsets are still rejected as before
+    if ISO_DATE_RE.fullmatch(date_string):
+        return datetime.fromisoformat(date_string)
+
+    # strptime also accepts unpadded fields such as '2024-1-5' or '2024-01-05 9:05:00'
+    for fmt in date_formats:
+        try:
+            return datetime.strptime(date_string, fmt)
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid date format for '{date_string}'")
+
+
 def to_datetime(date_string):
     """
     Converts a date string to a datetime object.
@@ -28,21 +63,11 @@ def to_datetime(date_string):
     if not date_string or not isinstance(date_string, str):
         return None
 
-    formats = [
-        '%Y-%m-%d %H:%M:%S.%f',
-        '%Y-%m-%d %H:%M:%S',
-        '%Y-%m-%d %H:%M',
-        '%Y-%m-%d'
-    ]
-
-    for fmt in formats:
-        try:
-            return datetime.strptime(date_string.strip(), fmt)
-        except ValueError:
-            continue
-
-    logger.error(f"Invalid date format for '{date_string}'")
-    return None
+    try:
+        return parse_datetime(date_string.strip())
+    except ValueError:
+        logger.error(f"Invalid date format for '{date_string}'")
+        return None
 
 
 def to_int(value):
@@ -77,7 +102,7 @@ def to_array(field_string):
     """
     if not field_string:
         return []
-    return [item.strip() for item in field_string.split(',') if item.strip()]
+    return [item for item in map(str.strip, field_string.split(',')) if item]
 
 
 def make_subdocuments(string: str, field_key: str, registry, separator = ';'):
@@ -88,9 +113,6 @@ def make_subdocuments(string: str, field_key: str, registry, separator = ';'):
     if not string:
         return []
 
-    if string == '':
-        return []
-
     config = registry.get(field_key)
     if not config or not callable(config.get('transform')):
         logger.error(f"Invalid subdocument config for field '{field_key}'")
@@ -99,19 +121,22 @@ def make_subdocuments(string: str, field_key: str, registry, separator = ';'):
     pattern = config.get('pattern')
     transform = config['transform']
 
-    entries = [entry.strip() for entry in string.split(separator) if entry.strip()]
-
-    if pattern:
-        transformed_list = []
-        for entry in entries:
-            match = pattern.match(entry)
-            if match:
-                transformed_list.append(transform(match))
-            else:
-                logger.warning(f"No match for entry: '{entry}' in field '{field_key}'")
-        return transformed_list
+    if not pattern:
+        return [transform(entry) for entry in map(str.strip, string.split(separator)) if entry]
 
-    return [transform(entry) for entry in entries]
+    # Split, strip and match in one pass; entries are matched separately so a
+    # malformed entry cannot be absorbed into its neighbour's match
+    match_entry = pattern.match
+    transformed_list = []
+    for entry in map(str.strip, string.split(separator)):
+        if not entry:
+            continue
+        match = match_entry(entry)
+        if match:
+            transformed_list.append(transform(match))
+        else:
+            logger.warning(f"No match for entry: '{entry}' in field '{field_key}'")
+    return transformed_list
 
 
 def make_array(string: str, field_key: str, registry, separator=';'):
@@ -128,5 +153,5 @@ def make_array(string: str, field_key: str, registry, separator=';'):
         return []
 
     transform = config['transform']
-    entries = [entry.strip() for entry in string.split(separator) if entry.strip()]
+    entries = [entry for entry in map(str.strip, string.split(separator)) if entry]
     return [transform(entry) for entry in entries]
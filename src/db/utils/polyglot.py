@@ -3,12 +3,20 @@
 # Imports
 import json
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from loguru import logger
 from bson import ObjectId
 from .embedding import vectorise_many
 
 
+# Max rows per UNWIND parameter list, to keep each Cypher call small
+CYPHER_BATCH_SIZE = 5000
+
+# Load bookkeeping fields that should never reach the graph
+internal_fields = ["content_hash"]
+
 collection_label_map = {
     "books": "Book",
     "book_versions": "BookVersion",
@@ -126,21 +134,20 @@ def flatten_document(entry, field_map):
     return entry
 
 
-def fetch_from_mongo(collection, exclude_fields=None, field_map=None, since=None):
+def fetch_stages(exclude_fields=None, since=None):
     """
-    Fetch documents updated since 'since' with field exclusions and flattening.
+    Build the $match/$project stages equivalent to fetch_from_mongo's find().
     """
-    if exclude_fields is None:
-        exclude_fields = []
-    if field_map is None:
-        field_map = {}
+    stages = [{"$match": {"updated_at": {"$gt": since}}}] if since else []
+    stages.append({"$project": {field: 0 for field in (exclude_fields or []) + internal_fields}})
+    return stages
 
-    # Build query
-    query = {"updated_at": {"$gt": since}} if since else {}
-    projection = {field: 0 for field in exclude_fields}
-
-    docs = list(collection.find(query, projection))
 
+def flatten_docs(docs, field_map=None):
+    """
+    Convert BSON values and flatten each fetched document.
+    """
+    field_map = field_map or {}
     flattened = []
     for doc in docs:
         # Use existing safe_value to handle BSON types
@@ -149,11 +156,56 @@ def fetch_from_mongo(collection, exclude_fields=None, field_map=None, since=None
         # Use existing flattening logic
         flat = flatten_document(doc, field_map)
         flattened.append(flat)
+    return flattened
+
+
+def fetch_from_mongo(collection, exclude_fields=None, field_map=None, since=None):
+    """
+    Fetch documents updated since 'since' with field exclusions and flattening.
+    """
+    if exclude_fields is None:
+        exclude_fields = []
+
+    # Build query
+    query = {"updated_at": {"$gt": since}} if since else {}
+    projection = {field: 0 for field in exclude_fields + internal_fields}
+
+    flattened = flatten_docs(collection.find(query, projection), field_map)
 
     logger.success(f"Fetched {len(flattened)} updated documents from {collection.name}.")
     return flattened
 
 
+def fetch_many_from_mongo(db, specs: dict, since=None):
+    """
+    Fetch several (small) collections in one round trip by chaining them with $unionWith.
+    specs maps collection name -> fetch_from_mongo kwargs (exclude_fields, field_map).
+    Returns {collection name: flattened docs}.
+    """
+    if not specs:
+        return {}
+
+    def tagged(name, kwargs):
+        stages = fetch_stages(kwargs.get("exclude_fields"), since)
+        return stages + [{"$addFields": {"_collection": name}}]
+
+    (first, first_kwargs), *rest = specs.items()
+    pipeline = tagged(first, first_kwargs) + [
+        {"$unionWith": {"coll": name, "pipeline": tagged(name, kwargs)}}
+        for name, kwargs in rest
+    ]
+
+    grouped = {name: [] for name in specs}
+    for doc in db[first].aggregate(pipeline):
+        grouped[doc.pop("_collection")].append(doc)
+
+    results = {}
+    for name, docs in grouped.items():
+        results[name] = flatten_docs(docs, specs[name].get("field_map"))
+        logger.success(f"Fetched {len(results[name])} updated documents from {name}.")
+    return results
+
+
 def fetch_club_period_books(db):
     """Find the books selected by clubs to read and the selection periods."""
     cpb = fetch_from_mongo(db["club_period_books"])
@@ -360,17 +412,62 @@ def sync_deletions(driver, db, since):
             logger.success(f"Deleted {len(ids)} '{label}' nodes from AuraDB.")
 
 
-def upsert_nodes(tx, label, rows, id_field="_id"):
-    """Generic AuraDB upsert function"""
-    query = f"""
+def batches(rows: list, batch_size: int = CYPHER_BATCH_SIZE):
+    """Yield consecutive slices of at most batch_size rows."""
+    for start in range(0, len(rows), batch_size):
+        yield rows[start:start + batch_size]
+
+
+@lru_cache(maxsize=256)
+def upsert_query(label: str, id_field: str) -> str:
+    """Build (once per label) the UNWIND upsert query for a node label."""
+    return f"""
     UNWIND $rows AS row
     MERGE (n:{label} {{_id: row.{id_field}}})
     SET n += row
     """
-    tx.run(query, rows=rows)
+
+
+def write_batch(tx, query: str, **params) -> list:
+    """Transaction function running one batch query; returns its records as dicts."""
+    return tx.run(query, **params).data()
+
+
+def upsert_nodes(session, label, rows, id_field="_id", batch_size: int = CYPHER_BATCH_SIZE):
+    """
+    Generic AuraDB upsert function.
+    Each batch commits in its own transaction, bounding transaction memory and locks.
+    """
+    query = upsert_query(label, id_field)
+    for batch in batches(rows, batch_size):
+        session.execute_write(write_batch, query, rows=batch)
     logger.success(f"Upserted {len(rows)} '{label}' nodes into Neo4j database.")
 
 
+def in_transaction(tx_func):
+    """Adapt a (tx, *args) function into a session job that runs it as one write transaction."""
+    def job(session, *args):
+        return session.execute_write(tx_func, *args)
+    return job
+
+
+def run_write_jobs(driver, jobs, max_workers: int = 8):
+    """
+    Run independent write jobs concurrently, one session per job.
+    Each job is a (func, *args) tuple called as func(session, *args);
+    returns once every job has committed. Jobs that MERGE onto the same nodes
+    can deadlock each other, so run those with max_workers=1.
+    """
+    def run_job(job):
+        func, *args = job
+        with driver.session() as session:
+            func(session, *args)
+
+    # Sessions are not thread-safe, but the driver and its connection pool are
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(run_job, jobs))
+
+
 def clear_all_nodes(driver):
     """Clear all nodes in graph."""
     query = "MATCH (n) DETACH DELETE n"
@@ -433,10 +530,32 @@ def ensure_constraints(driver, constraints_map):
             logger.info(f"Verified constraint for {label}({prop})")
 
 
-def create_relationships(tx, rel_map, rel: str, source_docs):
+@lru_cache(maxsize=256)
+def relationship_query(source_label: str, target_label: str, rel: str,
+                       source_prop: str, target_prop: str) -> str:
+    """
+    Build (once per edge type) the query that prunes a source node's
+    old relationships of type rel and merges the current ones.
+    """
+    return f"""
+    MATCH (source:{source_label})
+    WHERE source._id IN $ids
+    OPTIONAL MATCH (source)-[old_rel:{rel}]->()
+    DELETE old_rel
+    WITH source
+    WHERE source.{source_prop} IS NOT NULL
+    UNWIND source.{source_prop} AS value
+    MATCH (target:{target_label} {{{target_prop}: value}})
+    MERGE (source)-[:{rel}]->(target)
+    RETURN count(*) AS relationships_created
+    """
+
+
+def create_relationships(session, rel_map, rel: str, source_docs):
     """
     Create relationship between two labels
     while pruning old relationships for the updated batch.
+    Each batch of source nodes is pruned and merged in its own transaction.
     """
     # Extract node labels, fields, updated source _ids
     source_label = rel_map["labels"][0]
@@ -449,21 +568,11 @@ def create_relationships(tx, rel_map, rel: str, source_docs):
         return
 
     # Delete only the specific relationship type for nodes being updated
-    query = f"""
-    MATCH (source:{source_label})
-    WHERE source._id IN $ids
-    OPTIONAL MATCH (source)-[old_rel:{rel}]->()
-    DELETE old_rel
-    WITH source
-    WHERE source.{source_prop} IS NOT NULL
-    UNWIND source.{source_prop} AS value
-    MATCH (target:{target_label} {{{target_prop}: value}})
-    MERGE (source)-[:{rel}]->(target)
-    RETURN count(*) AS relationships_created
-    """
+    query = relationship_query(source_label, target_label, rel, source_prop, target_prop)
 
-    result = tx.run(query, ids=updated_ids)
-    count = result.single()["relationships_created"]
+    count = 0
+    for batch in batches(updated_ids):
+        count += session.execute_write(write_batch, query, ids=batch)[0]["relationships_created"]
     logger.info(f"Created {count} relationships of type {rel}")
 
 
@@ -489,7 +598,8 @@ def badges_relationships(tx, docs: list, label="User"):
     OPTIONAL MATCH (source)-[r:HAS_BADGE]->()
     DELETE r
     """
-    tx.run(prune_query, ids=updated_ids)
+    for batch in batches(updated_ids):
+        tx.run(prune_query, ids=batch)
 
     # Merge the current badge list
     rows = []
@@ -508,7 +618,8 @@ def badges_relationships(tx, docs: list, label="User"):
         MERGE (a)-[rel:HAS_BADGE]->(b)
         SET rel.earnedOn = row.earned_on
         """
-        tx.run(merge_query, rows=rows)
+        for batch in batches(rows):
+            tx.run(merge_query, rows=batch)
 
     logger.info(f"Refreshed {len(rows)} {source_label}-Badge relationships.")
 
@@ -541,7 +652,8 @@ def user_reads_relationships(tx, user_reads):
     MATCH (u:User {_id: row.user_id})-[r:DID_NOT_FINISH|HAS_READ|HAS_PAUSED|IS_READING|WANTS_TO_READ]->(b:BookVersion {_id: row.version_id})
     DELETE r
     """
-    tx.run(cleanup_query, rows=rows)
+    for batch in batches(rows):
+        tx.run(cleanup_query, rows=batch)
 
     # Merge new status relationship
     merge_query = """
@@ -557,14 +669,16 @@ def user_reads_relationships(tx, user_reads):
         rel.avgDaysToRead   = row.avg_days_to_read,
         rel.avgReadRate     = row.avg_read_rate
     """
-    tx.run(merge_query, rows=rows)
+    for batch in batches(rows):
+        tx.run(merge_query, rows=batch)
     logger.info(f"Updated reading status for {len(rows)} User-BookVersion pairs.")
 
 
-def book_awards_relationships(tx, updated_books, award_rows):
+def book_awards_relationships(session, updated_books, award_rows):
     """
     Create HAS_AWARD relationships between Book and Award labels.
     Prune and merge existing relationships to facilitate updates.
+    Each batch commits in its own transaction.
     """
     if not updated_books:
         return
@@ -577,7 +691,8 @@ def book_awards_relationships(tx, updated_books, award_rows):
     OPTIONAL MATCH (b)-[r:HAS_AWARD]->()
     DELETE r
     """
-    tx.run(prune_query, ids=updated_book_ids)
+    for batch in batches(updated_book_ids):
+        session.execute_write(write_batch, prune_query, ids=batch)
 
     # Merge new award data
     if award_rows:
@@ -592,17 +707,19 @@ def book_awards_relationships(tx, updated_books, award_rows):
                 SET rel.category = row.award_category
             )
         """
-        tx.run(merge_query, rows=award_rows)
+        for batch in batches(award_rows):
+            session.execute_write(write_batch, merge_query, rows=batch)
 
     logger.info(f"Created or updated {len(updated_book_ids)} Book-Award relationships")
 
 
-def club_book_relationships(tx, db):
+def club_book_relationships(session, cpb):
     """
-    Create SELECTED_FOR_PERIOD relationships between Club and Book.
+    Create SELECTED_FOR_PERIOD relationships between Club and Book
+    from fetch_club_period_books rows.
     Refresh club selections by pruning specific club/book/period triples.
+    Each batch commits in its own transaction.
     """
-    cpb = fetch_club_period_books(db)
     if not cpb:
         return
 
@@ -615,7 +732,8 @@ def club_book_relationships(tx, db):
     WHERE r.period = row.period
     DELETE r
     """
-    tx.run(prune_query, rows=prune_rows)
+    for batch in batches(prune_rows):
+        session.execute_write(write_batch, prune_query, rows=batch)
 
     # Merge only currently 'selected' books
     merge_rows = []
@@ -636,6 +754,7 @@ def club_book_relationships(tx, db):
         SET rel.period = row.period, rel.startDate = row.startdate,
             rel.endDate = row.enddate, rel.selectionMethod = row.selection_method
         """
-        tx.run(merge_query, rows=merge_rows)
+        for batch in batches(merge_rows):
+            session.execute_write(write_batch, merge_query, rows=batch)
 
     logger.info(f"Created or updated {len(prune_rows)} Club-Book relationships.")
@@ -1,7 +1,10 @@
 """Security utility functions"""
 
 # Imports
+import hashlib
+import hmac
 import json
+from functools import lru_cache
 import bcrypt
 from cryptography.fernet import Fernet
 from src.config import key_registry_path
@@ -15,7 +18,22 @@ with open(key_registry_path, 'r', encoding='utf-8') as f:
 
 # Use latest key as default
 latest_key_version = sorted(key_registry.keys())[-1]
-default_cipher = Fernet(key_registry[latest_key_version].encode())
+
+
+@lru_cache(maxsize=None)
+def get_cipher(version: str) -> Fernet:
+    """
+    Returns the Fernet cipher for a key version, built once per version.
+    """
+    return Fernet(key_registry[version].encode())
+
+
+default_cipher = get_cipher(latest_key_version)
+
+# HMAC key for fingerprints, derived from (not reusing) the latest encryption key
+fingerprint_key = hashlib.sha256(
+    b"fingerprint:" + key_registry[latest_key_version].encode()
+).digest()
 
 
 # SECURITY FUNCTIONS
@@ -29,6 +47,16 @@ def hash_password(plain_password: str) -> str:
     return hashed.decode('utf-8')
 
 
+def fingerprint(value: str) -> str:
+    """
+    Keyed (HMAC-SHA256) digest of a secret, to detect changes to it without storing
+    anything that can be checked against guesses offline.
+    """
+    if value is None:
+        return None
+    return hmac.new(fingerprint_key, value.encode('utf-8'), hashlib.sha256).hexdigest()
+
+
 def verify_password(entered_password: str, stored_hash: str) -> bool:
     """
     Password verification for user account access.
@@ -42,7 +70,7 @@ def encrypt_pii(value: str, version: str = latest_key_version) -> str:
     """
     if value is None:
         return None
-    cipher = Fernet(key_registry[version].encode())
+    cipher = get_cipher(version)
     return cipher.encrypt(value.encode('utf-8')).decode('utf-8')
 
 
@@ -52,7 +80,7 @@ def decrypt_pii(encrypted_value: str, version: str) -> str:
     """
     if encrypted_value is None:
         return None
-    cipher = Fernet(key_registry[version].encode())
+    cipher = get_cipher(version)
     return cipher.decrypt(encrypted_value.encode('utf-8')).decode('utf-8')
 
 
@@ -62,7 +90,7 @@ def decrypt_field(value, version):
     """
     if not value or version not in key_registry:
         return value
-    cipher = Fernet(key_registry[version].encode())
+    cipher = get_cipher(version)
     return cipher.decrypt(value.encode()).decode()
 
 
@@ -72,5 +100,5 @@ def encrypt_field(value, version):
     """
     if not value or version not in key_registry:
         return value
-    cipher = Fernet(key_registry[version].encode())
+    cipher = get_cipher(version)
     return cipher.encrypt(value.encode()).decode()
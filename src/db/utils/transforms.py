@@ -2,34 +2,98 @@
 
 # Imports
 import os
-import json
+import sys
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
+import orjson
+import xxhash
 from loguru import logger
 from src.config import RAW_COLLECTIONS_DIR, TRANSFORMED_COLLECTIONS_DIR
+from .files import read_json, write_json
 from .derived_fields import generate_rlog, compute_d2r, compute_rr, find_doc
 from .parsers import clean_document
 
 
 # pylint: disable=line-too-long
 
-def transform_collection(collection_name: str, transform_func):
+# Collections cleanup stamps with add_timestamp, after their transform (if any)
+collections_to_timestamp = [
+    "genres", "club_event_types", "club_event_statuses",
+    "user_permissions", "publishers", "tags", "awards"
+]
+
+# Fields stamped with the run time instead of taken from the source, by collection.
+# transform_collection and add_timestamp stamp them from here; load_mongo leaves them out
+# of the content hash and only sets them on insert, so they keep the first load's time.
+run_stamped_fields = {
+    **dict.fromkeys(collections_to_timestamp, ("date_added",)),
+    **dict.fromkeys((
+        "creators", "user_roles", "user_badges", "club_period_books", "club_events",
+        "club_reading_periods", "club_badges"
+    ), ("date_added",)),
+    "club_member_reads": ("timestamp",),
+}
+
+# Run timestamp, shared by every document stamped in this run
+run_timestamp = str(datetime.now())
+
+# Field storing a hash of each transformed doc, so load_mongo can skip unchanged docs
+CONTENT_HASH_FIELD = "content_hash"
+
+
+def content_hash(doc: dict, exclude=()) -> str:
+    """
+    Hash a transformed doc without its exclude fields
+    (non-cryptographic; stored as hex to fit in BSON).
+    """
+    if exclude:
+        doc = {k: v for k, v in doc.items() if k not in exclude}
+    return xxhash.xxh3_64_hexdigest(orjson.dumps(doc, option=orjson.OPT_SORT_KEYS))
+
+def fork_context():
+    """
+    Returns the fork multiprocessing context, or None where forking isn't available or safe:
+    Windows has no fork, and macOS can crash forking a process that already runs threads
+    (PyMongo, gspread and earlier ETL steps start some in the same process).
+    """
+    if sys.platform != "linux" or "fork" not in multiprocessing.get_all_start_methods():
+        return None
+    return multiprocessing.get_context("fork")
+
+
+def transform_collection(collection_name: str, transform_func, workers: int = 0):
     """
     Loads a raw JSON collection, transforms each document,
     and writes the result to TRANSFORMED_COLLECTIONS_DIR.
     Assumes _id is already present in the input.
+    Fields in run_stamped_fields[collection_name] are stamped with the run timestamp.
+    If workers > 1, documents are transformed across that many forked processes
+    (serially where fork isn't available); transform_func must be a module-level function.
     """
     input_path = os.path.join(RAW_COLLECTIONS_DIR, f"{collection_name}.json")
     output_path = os.path.join(TRANSFORMED_COLLECTIONS_DIR, f"{collection_name}.json")
 
     try:
-        with open(input_path, encoding="utf-8") as f:
-            raw_docs = json.load(f)
-
+        raw_docs = read_json(input_path)
+
+        mp_context = fork_context()
+        if workers > 1 and len(raw_docs) > 1 and mp_context is not None:
+            # Fork so workers inherit the lookup data already loaded by the transform module
+            chunksize = max(1, len(raw_docs) // (workers * 4))
+            with ProcessPoolExecutor(workers, mp_context=mp_context) as pool:
+                docs = list(pool.map(transform_func, raw_docs, chunksize=chunksize))
+        else:
+            docs = map(transform_func, raw_docs)
+
+        stamped_fields = run_stamped_fields.get(collection_name, ())
         transformed = []
         removed_keys = []
-        for doc in raw_docs:
-            clean_doc, removed = clean_document(transform_func(doc))
+        for doc in docs:
+            clean_doc, removed = clean_document(doc)
+            for field in stamped_fields:
+                clean_doc[field] = run_timestamp
             transformed.append(clean_doc)
             removed_keys.extend(removed)
 
@@ -37,8 +101,7 @@ def transform_collection(collection_name: str, transform_func):
         if counts != {}:
             logger.warning(f"The following keys were removed: {counts}")
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(transformed, f, ensure_ascii=False, indent=2)
+        write_json(output_path, transformed)
 
         logger.info(f"Transformed {len(transformed)} records -> {output_path}")
 
@@ -48,6 +111,22 @@ def transform_collection(collection_name: str, transform_func):
         logger.error(f"Error transforming '{collection_name}': {e}")
 
 
+def transform_collections(tasks: list, workers: int = 0):
+    """
+    Runs transform_collection for each (collection_name, transform_func) task.
+    Collections don't depend on each other, so if workers > 1 they are
+    transformed across that many forked processes (serially where fork isn't available).
+    """
+    mp_context = fork_context()
+    if workers > 1 and len(tasks) > 1 and mp_context is not None:
+        names, funcs = zip(*tasks)
+        with ProcessPoolExecutor(min(workers, len(tasks)), mp_context=mp_context) as pool:
+            list(pool.map(transform_collection, names, funcs))
+    else:
+        for collection_name, transform_func in tasks:
+            transform_collection(collection_name, transform_func)
+
+
 def remove_custom_ids(collections_to_cleanup: dict, source_directory):
     """
     Removes specified custom ID fields from each collection in the source directory,
@@ -61,8 +140,7 @@ def remove_custom_ids(collections_to_cleanup: dict, source_directory):
         output_path = output_directory / f"{collection_name}.json"
 
         try:
-            with input_path.open(encoding="utf-8") as f:
-                data = json.load(f)
+            data = read_json(input_path)
             logger.info(f"Loaded {len(data)} documents from '{input_path.name}'")
 
             cleaned = []
@@ -70,14 +148,13 @@ def remove_custom_ids(collections_to_cleanup: dict, source_directory):
                 doc.pop(id_field, None)
                 cleaned.append(doc)
 
-            with output_path.open("w", encoding="utf-8") as f:
-                json.dump(cleaned, f, ensure_ascii=False, indent=2)
+            write_json(output_path, cleaned)
 
             logger.success(f"Removed '{id_field}' from all documents in '{collection_name}.json'")
 
         except FileNotFoundError:
             logger.warning(f"File not found: {input_path}")
-        except (json.JSONDecodeError, TypeError, ValueError) as e:
+        except (TypeError, ValueError) as e:
             logger.error(f"Failed to process '{input_path.name}': {e}")
 
 
@@ -98,8 +175,7 @@ def change_id_field(collections_to_update: dict, source_directory):
         output_path = output_directory / f"{collection_name}.json"
 
         try:
-            with input_path.open(encoding="utf-8") as f:
-                data = json.load(f)
+            data = read_json(input_path)
             logger.info(f"Loaded {len(data)} documents from '{input_path.name}'")
 
             updated = []
@@ -109,14 +185,13 @@ def change_id_field(collections_to_update: dict, source_directory):
                     del doc[custom_id_field]
                 updated.append(doc)
 
-            with output_path.open("w", encoding="utf-8") as f:
-                json.dump(updated, f, ensure_ascii=False, indent=2)
+            write_json(output_path, updated)
 
             logger.success(f"Replaced _id with '{custom_id_field}' in all documents of '{output_path.name}'")
 
         except FileNotFoundError:
             logger.warning(f"File not found: {input_path}")
-        except (json.JSONDecodeError, TypeError, ValueError) as e:
+        except (TypeError, ValueError) as e:
             logger.error(f"Failed to process '{input_path.name}': {e}")
 
 
@@ -137,8 +212,7 @@ def remove_document_by_index(collection_name: str, source_directory, index: int)
     output_path = output_directory / f"{collection_name}.json"
 
     try:
-        with input_path.open(encoding="utf-8") as f:
-            data = json.load(f)
+        data = read_json(input_path)
         logger.info(f"Loaded {len(data)} documents from '{input_path.name}'")
 
         if index < 1 or index > len(data):
@@ -149,14 +223,13 @@ def remove_document_by_index(collection_name: str, source_directory, index: int)
         removed_id = removed_doc.get("_id", "unknown")
         logger.success(f"Removed document at index {index} (id: {removed_id}) from '{collection_name}'")
 
-        with output_path.open("w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        write_json(output_path, data)
 
         logger.info(f"Saved updated collection to '{output_path.name}'")
 
     except FileNotFoundError:
         logger.error(f"File not found: {input_path}")
-    except (json.JSONDecodeError, TypeError, ValueError) as e:
+    except (TypeError, ValueError) as e:
         logger.error(f"Failed to process '{input_path.name}': {e}")
 
 
@@ -178,49 +251,47 @@ def remove_documents_by_field(collection_name: str, source_directory, field_name
     output_path = output_directory / f"{collection_name}.json"
 
     try:
-        with input_path.open(encoding="utf-8") as f:
-            data = json.load(f)
+        data = read_json(input_path)
         logger.info(f"Loaded {len(data)} documents from '{input_path.name}'")
 
         filtered = [doc for doc in data if doc.get(field_name) != field_value]
         removed_count = len(data) - len(filtered)
 
-        with output_path.open("w", encoding="utf-8") as f:
-            json.dump(filtered, f, ensure_ascii=False, indent=2)
+        write_json(output_path, filtered)
 
         logger.success(f"Removed {removed_count} documents from '{collection_name}' where {field_name} == {field_value}")
         logger.info(f"Saved {len(filtered)} remaining documents to '{output_path.name}'")
 
     except FileNotFoundError:
         logger.error(f"File not found: {input_path}")
-    except (json.JSONDecodeError, TypeError, ValueError) as e:
+    except (TypeError, ValueError) as e:
         logger.error(f"Failed to process '{input_path.name}': {e}")
 
 
 def add_timestamp(collection_name: str):
     """
-    Adds a 'date_added' field to each document in the specified collection.
+    Stamps the collection's run_stamped_fields ('date_added')
+    on each document in the specified collection.
     """
     directory = Path(TRANSFORMED_COLLECTIONS_DIR)
     file_path = directory / f"{collection_name}.json"
 
     try:
-        with file_path.open(encoding="utf-8") as f:
-            data = json.load(f)
+        data = read_json(file_path)
         logger.info(f"Loaded {len(data)} documents from '{file_path.name}'")
 
-        now_str = str(datetime.now())
+        stamped_fields = run_stamped_fields[collection_name]
         for doc in data:
-            doc["date_added"] = now_str
+            for field in stamped_fields:
+                doc[field] = run_timestamp
 
-        with file_path.open("w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        write_json(file_path, data)
 
-        logger.success(f"Added 'date_added' to all documents in '{collection_name}'")
+        logger.success(f"Added {stamped_fields} to all documents in '{collection_name}'")
 
     except FileNotFoundError:
         logger.error(f"File not found: {file_path}")
-    except (json.JSONDecodeError, TypeError, ValueError) as e:
+    except (TypeError, ValueError) as e:
         logger.error(f"Failed to process '{file_path.name}': {e}")
 
 
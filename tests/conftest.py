@@ -0,0 +1,25 @@
+"""Shared pytest fixtures"""
+
+# Imports
+import importlib
+import sys
+from collections import defaultdict
+from types import SimpleNamespace
+import pytest
+from src.db.utils import connectors, files, lookups
+
+
+@pytest.fixture
+def import_transform(monkeypatch):
+    """
+    Imports a transform module without the raw collections or Azure it reads at import:
+    lookups resolve to nothing, raw JSON reads return [] and the blob client is faked.
+    """
+    def _import(module_name):
+        monkeypatch.setattr(lookups, "load_lookup_data", lambda registry: defaultdict(dict))
+        monkeypatch.setattr(files, "read_json", lambda path: [])
+        monkeypatch.setattr(connectors, "connect_azure_blob",
+                            lambda: SimpleNamespace(account_name="test"))
+        sys.modules.pop(module_name, None)
+        return importlib.import_module(module_name)
+    return _import
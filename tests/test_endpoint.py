@@ -0,0 +1,314 @@
+"""Tests for src.admin_portal.endpoint"""
+
+# Imports
+import asyncio
+from collections import Counter, defaultdict
+from types import SimpleNamespace
+import pytest
+
+pytest.importorskip("fastapi.testclient")
+
+import orjson
+from bson import Binary, Decimal128, ObjectId, Timestamp
+from cachetools import TTLCache
+from fastapi.testclient import TestClient
+from pymongo.errors import PyMongoError
+from src.admin_portal import endpoint
+from src.admin_portal.endpoint import dumps_mongo
+
+OID = "64b7f0c2a1b2c3d4e5f60718"
+ADMIN = {"_id": ObjectId("64b7f0c2a1b2c3d4e5f60701"), "username": "ada", "role": "admin"}
+MEMBER = {"_id": ObjectId("64b7f0c2a1b2c3d4e5f60702"), "username": "bob", "role": "member"}
+
+
+def matches(doc: dict, query: dict) -> bool:
+    """Equality and $in matching, enough for the endpoint queries under test."""
+    for key, value in query.items():
+        if isinstance(value, dict) and "$in" in value:
+            if doc.get(key) not in value["$in"]:
+                return False
+        elif doc.get(key) != value:
+            return False
+    return True
+
+
+class FakeCursor:
+    """Async cursor over fixed docs; can raise mid-stream or block until cancelled."""
+    def __init__(self, docs, fail_after=None, block=False):
+        self.docs = docs
+        self.fail_after = fail_after
+        self.block = block
+        self.position = 0
+        self.closed = False
+        self.cancelled = False
+        self.finished = False
+
+    def sort(self, *args):
+        return self
+
+    def limit(self, n):
+        return self
+
+    async def to_list(self):
+        if self.block:
+            try:
+                await asyncio.sleep(3600)
+            except asyncio.CancelledError:
+                self.cancelled = True
+                raise
+        self.finished = True
+        return [dict(doc) for doc in self.docs]
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.position == self.fail_after:
+            raise PyMongoError("connection reset")
+        if self.position >= len(self.docs):
+            raise StopAsyncIteration
+        self.position += 1
+        return dict(self.docs[self.position - 1])
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeCollection:
+    """Async collection over a list of docs, counting the calls made to it."""
+    def __init__(self, docs=(), **cursor_options):
+        self.docs = list(docs)
+        self.cursor_options = cursor_options
+        self.cursors = []
+        self.calls = Counter()
+
+    def find(self, query=None, projection=None):
+        docs = [doc for doc in self.docs if matches(doc, query or {})]
+        cursor = FakeCursor(docs, **self.cursor_options)
+        self.cursors.append(cursor)
+        return cursor
+
+    async def find_one(self, query, projection=None):
+        self.calls["find_one"] += 1
+        await asyncio.sleep(0)  # Yield like a real round trip, so concurrent tasks start
+        return next((dict(doc) for doc in self.docs if matches(doc, query)), None)
+
+    async def estimated_document_count(self):
+        self.calls["count"] += 1
+        return len(self.docs)
+
+    async def count_documents(self, query):
+        self.calls["count"] += 1
+        return sum(matches(doc, query) for doc in self.docs)
+
+    async def insert_many(self, docs, ordered=True):
+        for doc in docs:
+            doc["_id"] = ObjectId()
+        self.docs.extend(docs)
+        return SimpleNamespace(inserted_ids=[doc["_id"] for doc in docs])
+
+    async def update_one(self, query, update):
+        doc = next((doc for doc in self.docs if matches(doc, query)), None)
+        if doc is not None:
+            doc.update(update["$set"])
+        return SimpleNamespace(matched_count=int(doc is not None))
+
+    async def delete_one(self, query):
+        before = len(self.docs)
+        self.docs = [doc for doc in self.docs if not matches(doc, query)]
+        return SimpleNamespace(deleted_count=before - len(self.docs))
+
+
+class Clock:
+    """Manually advanced timer for TTLCache."""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def db(monkeypatch, clock):
+    """Replace the database and caches; users holds an admin and a member."""
+    collections = defaultdict(FakeCollection)
+    collections["users"] = FakeCollection([dict(ADMIN), dict(MEMBER)])
+    monkeypatch.setattr(endpoint, "db", collections)
+    monkeypatch.setattr(endpoint, "stats_cache", TTLCache(
+        maxsize=1, ttl=endpoint.STATS_CACHE_TTL_SECONDS, timer=clock
+    ))
+    monkeypatch.setattr(endpoint, "auth_cache", TTLCache(
+        maxsize=16, ttl=endpoint.AUTH_CACHE_TTL_SECONDS, timer=clock
+    ))
+    return collections
+
+
+@pytest.fixture
+def client(db):
+    # Not used as a context manager, so lifespan (indexes, process pool) doesn't run
+    return TestClient(endpoint.app)
+
+
+def auth(user: dict) -> dict:
+    """Bearer header for a token issued to user."""
+    token = endpoint.create_access_token({"sub": str(user["_id"])})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_dumps_mongo_serializes_bson_types():
+    doc = {
+        "_id": ObjectId(OID),
+        "email_address": Binary(b"gAAAAABtoken"),
+        "raw": b"\xff\x00",
+        "price": Decimal128("12.50"),
+        "ts": Timestamp(1700000000, 1),
+    }
+    assert orjson.loads(dumps_mongo(doc)) == {
+        "_id": OID,
+        "email_address": "gAAAAABtoken",
+        "raw": "/wA=",
+        "price": 12.5,
+        "ts": {"$timestamp": {"t": 1700000000, "i": 1}},
+    }
+
+
+def test_dumps_mongo_rejects_non_bson_types():
+    with pytest.raises(TypeError):
+        dumps_mongo({"value": object()})
+
+
+def test_stats_are_cached_until_the_ttl_expires(client, db, clock):
+    headers = auth(ADMIN)
+    first = client.get("/api/stats", headers=headers).json()
+    assert first["users_count"] == 2 and first["admin_count"] == 1
+    assert db["users"].calls["count"] == 2
+
+    db["users"].docs.append({"_id": ObjectId(), "username": "cy", "role": "member"})
+    assert client.get("/api/stats", headers=headers).json() == first
+    assert db["users"].calls["count"] == 2
+
+    clock.now += endpoint.STATS_CACHE_TTL_SECONDS + 1
+    assert client.get("/api/stats", headers=headers).json()["users_count"] == 3
+    assert db["users"].calls["count"] == 4
+
+
+def test_stats_require_an_admin(client, db):
+    assert client.get("/api/stats", headers=auth(MEMBER)).status_code == 403
+    assert db["users"].calls["count"] == 0
+
+
+def test_authenticated_users_are_cached_per_token(client, db):
+    headers = auth(ADMIN)
+    assert client.get("/api/auth/me", headers=headers).json()["username"] == "ada"
+    assert client.get("/api/auth/me", headers=headers).json()["username"] == "ada"
+    assert db["users"].calls["find_one"] == 1
+
+
+def test_auth_cache_entries_expire_after_the_ttl(client, db, clock):
+    headers = auth(ADMIN)
+    client.get("/api/auth/me", headers=headers)
+    clock.now += endpoint.AUTH_CACHE_TTL_SECONDS + 1
+    client.get("/api/auth/me", headers=headers)
+    assert db["users"].calls["find_one"] == 2
+
+
+def test_auth_cache_is_not_served_past_the_token_expiry(client, db):
+    headers = auth(ADMIN)
+    token = headers["Authorization"].removeprefix("Bearer ")
+    # An entry whose token has since expired is ignored, even within the cache TTL
+    endpoint.auth_cache[token] = (0, {"_id": "stale", "username": "stale", "role": "admin"})
+    assert client.get("/api/auth/me", headers=headers).json()["username"] == "ada"
+    assert db["users"].calls["find_one"] == 1
+
+
+def test_role_change_clears_the_auth_cache(client, db):
+    member_headers = auth(MEMBER)
+    assert client.get("/api/stats", headers=member_headers).status_code == 403
+
+    response = client.patch(
+        f"/api/users/{MEMBER['_id']}", json={"role": "admin"}, headers=auth(ADMIN)
+    )
+    assert response.status_code == 200
+    assert len(endpoint.auth_cache) == 0
+    assert client.get("/api/stats", headers=member_headers).status_code == 200
+
+
+def test_deleted_users_lose_access_immediately(client, db):
+    member_headers = auth(MEMBER)
+    assert client.get("/api/auth/me", headers=member_headers).status_code == 200
+
+    response = client.delete(f"/api/users/{MEMBER['_id']}", headers=auth(ADMIN))
+    assert response.status_code == 200
+    assert len(endpoint.auth_cache) == 0
+    assert client.get("/api/auth/me", headers=member_headers).status_code == 401
+
+
+def test_forbidden_admin_check_cancels_the_running_query(client, db):
+    db["users"].cursor_options["block"] = True
+    assert client.get("/api/users", headers=auth(MEMBER)).status_code == 403
+    [cursor] = db["users"].cursors
+    assert cursor.cancelled and cursor.closed and not cursor.finished
+
+
+def test_invalid_token_cancels_the_query_before_it_runs(client, db):
+    db["users"].cursor_options["block"] = True
+    headers = {"Authorization": "Bearer not-a-token"}
+    assert client.get("/api/users", headers=headers).status_code == 401
+    [cursor] = db["users"].cursors
+    assert cursor.closed and not cursor.finished
+
+
+def test_admin_check_runs_alongside_the_query(client, db):
+    response = client.get("/api/users", headers=auth(ADMIN))
+    assert [user["username"] for user in response.json()] == ["ada", "bob"]
+    assert not db["users"].cursors[0].closed
+
+
+def test_empty_listing_returns_an_empty_array(client, db):
+    response = client.get("/api/clubs", headers=auth(ADMIN))
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_listing_streams_every_document(client, db):
+    db["clubs"] = FakeCollection([{"_id": ObjectId(OID), "name": "A"}, {"name": "B"}])
+    response = client.get("/api/clubs", headers=auth(ADMIN))
+    assert response.json() == [{"_id": OID, "name": "A"}, {"name": "B"}]
+
+
+def test_database_error_mid_stream_leaves_the_array_unterminated(client, db):
+    db["clubs"] = FakeCollection([{"name": "A"}, {"name": "B"}, {"name": "C"}], fail_after=2)
+    response = client.get("/api/clubs", headers=auth(ADMIN))
+
+    # Headers were already sent, so the error can only show as invalid JSON
+    assert response.status_code == 200
+    assert response.content == b'[{"name":"A"},{"name":"B"}'
+    with pytest.raises(ValueError):
+        response.json()
+    assert db["clubs"].cursors[0].closed
+
+
+def new_user(username: str) -> dict:
+    return {"username": username, "email": f"{username}@example.com", "password": "pw"}
+
+
+def test_bulk_create_rejects_usernames_repeated_in_the_request(client, db):
+    body = [new_user("cy"), new_user("dee"), new_user("cy")]
+    response = client.post("/api/users/bulk", json=body, headers=auth(ADMIN))
+    assert response.status_code == 400
+    assert "cy" in response.json()["detail"]
+    assert len(db["users"].docs) == 2
+
+
+def test_bulk_create_skips_existing_usernames(client, db, monkeypatch):
+    monkeypatch.setattr(endpoint, "BCRYPT_ROUNDS", 4)
+    body = [new_user("bob"), new_user("cy")]
+    response = client.post("/api/users/bulk", json=body, headers=auth(ADMIN))
+    assert response.status_code == 201
+    assert response.json() == {"inserted_count": 1, "failed": ["bob"]}
+    assert [user["username"] for user in db["users"].docs] == ["ada", "bob", "cy"]
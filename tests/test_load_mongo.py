@@ -0,0 +1,116 @@
+"""Tests for src.db.etl.load.load_mongo"""
+
+# Imports
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+from bson import ObjectId
+from src.db.etl.load import load_mongo
+from src.db.etl.load.load_mongo import convert_fields, load_single_collection, to_object_id
+from src.db.utils.files import write_json
+from src.db.utils.transforms import CONTENT_HASH_FIELD, content_hash
+
+OID = "64b7f0c2a1b2c3d4e5f60718"
+OTHER_OID = "64b7f0c2a1b2c3d4e5f60719"
+
+
+def test_to_object_id_converts_valid_hex_strings():
+    assert to_object_id(OID) == ObjectId(OID)
+
+
+def test_to_object_id_leaves_none_and_invalid_values():
+    # ObjectId(None) would mint a fresh random id
+    assert to_object_id(None) is None
+    assert to_object_id("not-an-id") == "not-an-id"
+    oid = ObjectId(OID)
+    assert to_object_id(oid) is oid
+
+
+def test_convert_fields_converts_ids_dates_and_registry_paths():
+    doc = {
+        "_id": OID,
+        "club_id": OTHER_OID,
+        "topic_name": OID,
+        "timestamp": "2024-01-05 09:05",
+        "comments": [{"user_id": OID, "comment": "hi", "timestamp": "2024-01-06 10:00"}],
+    }
+    result = convert_fields(doc, "club_discussions")
+
+    assert result is doc  # Converted in place
+    assert doc["_id"] == ObjectId(OID)
+    assert doc["club_id"] == ObjectId(OTHER_OID)
+    assert doc["topic_name"] == OID  # Not in objectid_registry
+    assert doc["timestamp"] == datetime(2024, 1, 5, 9, 5)
+    assert doc["comments"][0]["user_id"] == ObjectId(OID)
+    assert doc["comments"][0]["timestamp"] == datetime(2024, 1, 6, 10, 0)
+
+
+def test_convert_fields_keeps_custom_string_ids():
+    doc = convert_fields({"_id": "rs1", "name": "Read"}, "read_statuses")
+    assert doc["_id"] == "rs1"
+
+
+def test_convert_fields_maps_objectid_lists_and_keeps_unresolved_entries():
+    doc = convert_fields({"_id": OID, "moderators": [OID, None, ObjectId(OTHER_OID)]}, "clubs")
+    assert doc["moderators"] == [ObjectId(OID), None, ObjectId(OTHER_OID)]
+
+
+def test_convert_fields_only_matches_full_registry_paths():
+    # user_id is an ObjectId path under comments, not under an unrelated nested dict
+    doc = convert_fields({"_id": OID, "other": {"user_id": OID}}, "club_discussions")
+    assert doc["other"]["user_id"] == OID
+
+
+class FakeCollection:
+    """Collection holding stored content hashes and recording bulk writes."""
+    def __init__(self, name, stored_hashes):
+        self.name = name
+        self.stored_hashes = stored_hashes
+        self.ops = []
+
+    def find(self, query, projection):
+        return [{"_id": _id, CONTENT_HASH_FIELD: h} for _id, h in self.stored_hashes.items()]
+
+    def bulk_write(self, ops, ordered):
+        self.ops.extend(ops)
+        return SimpleNamespace(upserted_count=len(ops), modified_count=0)
+
+
+@pytest.fixture
+def load(tmp_path, monkeypatch):
+    """Load docs as a collection file against stored hashes; return the update docs written."""
+    monkeypatch.setattr(load_mongo, "UpdateOne", lambda query, update, upsert: update)
+
+    def _load(collection_name, docs, stored_hashes):
+        file_path = tmp_path / f"{collection_name}.json"
+        write_json(file_path, docs)
+        collection = FakeCollection(collection_name, stored_hashes)
+        db = SimpleNamespace(get_collection=lambda name, write_concern: collection)
+        load_single_collection(db, file_path)
+        return collection.ops
+    return _load
+
+
+def test_load_skips_unchanged_docs_ignoring_run_stamps(load):
+    kept = {"_id": OID, "firstname": "Ann", "date_added": "2024-01-05 09:05"}
+    changed = {"_id": OTHER_OID, "firstname": "Bo", "date_added": "2024-01-05 09:05"}
+    stored = {
+        ObjectId(OID): content_hash({**kept, "date_added": "2023-01-01"}, ("date_added",)),
+        ObjectId(OTHER_OID): "stale",
+    }
+
+    [update] = load("creators", [kept, changed], stored)
+
+    assert update["$set"]["_id"] == ObjectId(OTHER_OID)
+    assert update["$set"][CONTENT_HASH_FIELD] == content_hash(changed, ("date_added",))
+    assert "date_added" not in update["$set"]
+    assert update["$setOnInsert"] == {"date_added": datetime(2024, 1, 5, 9, 5)}
+
+
+def test_load_uses_hashes_precomputed_by_the_transform(load):
+    # users re-salt their password on every run, so only the transform's hash is stable
+    doc = {"_id": OID, "handle": "ann", "password": "$2b$12$fresh", CONTENT_HASH_FIELD: "h1"}
+    assert load("users", [doc], {ObjectId(OID): "h1"}) == []
+
+    [update] = load("users", [dict(doc, **{CONTENT_HASH_FIELD: "h2"})], {ObjectId(OID): "h1"})
+    assert update["$set"][CONTENT_HASH_FIELD] == "h2"
@@ -0,0 +1,40 @@
+"""Tests for src.db.utils.parsers"""
+
+# Imports
+from datetime import datetime
+import pytest
+from src.db.utils.parsers import to_datetime
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2024-01-05", datetime(2024, 1, 5)),
+    ("2024-01-05 09:05", datetime(2024, 1, 5, 9, 5)),
+    ("2024-01-05 09:05:30", datetime(2024, 1, 5, 9, 5, 30)),
+    ("2024-01-05 09:05:30.5", datetime(2024, 1, 5, 9, 5, 30, 500000)),
+    (" 2024-01-05 ", datetime(2024, 1, 5)),
+    # Unpadded fields are still accepted through the strptime fallback
+    ("2024-1-5", datetime(2024, 1, 5)),
+    ("2024-01-05 9:05:00", datetime(2024, 1, 5, 9, 5)),
+])
+def test_to_datetime_parses_sheet_formats(value, expected):
+    assert to_datetime(value) == expected
+
+
+@pytest.mark.parametrize("value", [
+    "2024-01-05T09:05:00",
+    "2024-01-05 09:05:00+02:00",
+    "2024-01-05 09",
+    "05/01/2024",
+    "not a date",
+])
+def test_to_datetime_rejects_other_formats(value):
+    assert to_datetime(value) is None
+
+
+@pytest.mark.parametrize("value", [None, "", 20240105])
+def test_to_datetime_ignores_empty_and_non_strings(value):
+    assert to_datetime(value) is None
+
+
+def test_to_datetime_returns_naive_datetimes():
+    assert to_datetime("2024-01-05 09:05:30").tzinfo is None
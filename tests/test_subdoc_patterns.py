@@ -0,0 +1,61 @@
+"""Tests for the subdocument regexes in the transform modules"""
+
+# Imports
+import pytest
+
+
+@pytest.fixture
+def club_patterns(import_transform):
+    module = import_transform("src.db.etl.transforms.transform_clubs")
+    return {name: spec["pattern"] for name, spec in module.subdoc_registry.items()}
+
+
+@pytest.fixture
+def award_pattern(import_transform):
+    module = import_transform("src.db.etl.transforms.transform_books")
+    return module.subdoc_registry["awards"]["pattern"]
+
+
+@pytest.mark.parametrize("entry, expected", [
+    ("user_id: u1; comment: Great read; timestamp: 2024-01-05 09:05",
+     ("u1", "Great read", "2024-01-05 09:05")),
+    # Comments may contain ';' as long as it doesn't start the timestamp
+    ("user_id: u1; comment: Loved it; the ending too; timestamp: 2024-01-05 09:05",
+     ("u1", "Loved it; the ending too", "2024-01-05 09:05")),
+])
+def test_discussion_comments_match(club_patterns, entry, expected):
+    assert club_patterns["club_discussions"].match(entry).groups() == expected
+
+
+@pytest.mark.parametrize("entry", [
+    "user_id: u1; comment:; timestamp: 2024-01-05 09:05",
+    "user_id: u1; comment: hi; timestamp: 2024-01-05",
+])
+def test_discussion_comments_reject_empty_or_malformed(club_patterns, entry):
+    assert club_patterns["club_discussions"].match(entry) is None
+
+
+def test_badge_names_may_contain_commas(club_patterns):
+    match = club_patterns["badges"].match("badge: Read, Reviewed, timestamp: 2024-01-05")
+    assert match.groups() == ("Read, Reviewed", "2024-01-05")
+
+
+def test_badge_names_cannot_be_empty(club_patterns):
+    assert club_patterns["badges"].match("badge:, timestamp: 2024-01-05") is None
+
+
+@pytest.mark.parametrize("entry, expected", [
+    ("award_id: a1; award_name: Hugo Award; award_category: Best Novel; "
+     "year: 2020; award_status: won",
+     ("a1", "Hugo Award", "Best Novel", "2020", "won")),
+    ("award_id: a1; award_name: Hugo; Retro; award_category: ; "
+     "year: 2020; award_status: nominated",
+     ("a1", "Hugo; Retro", "", "2020", "nominated")),
+])
+def test_award_entries_match(award_pattern, entry, expected):
+    assert award_pattern.match(entry).groups() == expected
+
+
+def test_award_entries_require_every_field(award_pattern):
+    entry = "award_id: a1; award_name: X; year: 2020; award_status: won"
+    assert award_pattern.match(entry) is None
@@ -0,0 +1,111 @@
+"""Tests for src.db.etl.extract.sync_gsheet"""
+
+# Imports
+import pytest
+from src.db.etl.extract import sync_gsheet
+from src.db.etl.extract.sync_gsheet import (add_hashes, cleanup, load_hashes, save_hashes,
+                                            sync_sheet, update_records)
+from src.db.utils.files import read_json, write_json
+
+
+@pytest.fixture
+def data_dirs(tmp_path, monkeypatch):
+    """Point the raw collections and hash index at a temp directory."""
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    monkeypatch.setattr(sync_gsheet, "RAW_COLLECTIONS_DIR", raw_dir)
+    monkeypatch.setattr(sync_gsheet, "SYNC_HASHES_DIR", tmp_path / "hashes")
+    return raw_dir
+
+
+def test_add_hashes_identifies_by_id_fields_and_hashes_content():
+    docs = [{"name": "Fantasy", "description": "a"}, {"name": "Fantasy", "description": "b"}]
+    docs, hashes = add_hashes(docs, "genres")
+
+    assert hashes[0] == hashes[1]  # Same identifier fields
+    assert docs[0]["content_hash"] != docs[1]["content_hash"]
+    assert [doc["hash"] for doc in docs] == hashes
+
+
+def test_add_hashes_uses_content_hash_without_id_fields():
+    docs, hashes = add_hashes([{"user_id": "u1", "rating": "5"}], "user_reads")
+    assert hashes == [docs[0]["content_hash"]]
+
+
+def test_add_hashes_ignores_id_and_stale_hashes():
+    first, _ = add_hashes([{"_id": "a", "name": "x"}], "genres")
+    second, _ = add_hashes([{"_id": "b", "name": "x", "hash": 1, "content_hash": 2}], "genres")
+    assert first[0]["content_hash"] == second[0]["content_hash"]
+
+
+def test_saved_hashes_round_trip(data_dirs):
+    docs, hashes = add_hashes([{"_id": "a", "name": "x"}, {"_id": "b", "name": "y"}], "genres")
+    save_hashes(docs, [[d["hash"], d["content_hash"]] for d in docs], "genres")
+
+    stored = [{"_id": "a", "name": "x"}, {"_id": "b", "name": "y"}]
+    assert load_hashes(stored, "genres") == hashes
+    assert [d["content_hash"] for d in stored] == [d["content_hash"] for d in docs]
+
+
+def test_load_hashes_rejects_missing_stale_or_foreign_indexes(data_dirs):
+    docs = [{"_id": "a", "name": "x"}]
+    assert load_hashes(docs, "genres") is None  # No index yet
+
+    save_hashes(docs, [[1, 2]], "genres")
+    assert load_hashes([{"_id": "b", "name": "y"}], "genres") is None  # Doc not indexed
+
+    index_path = sync_gsheet.SYNC_HASHES_DIR / "genres.json"
+    index = read_json(index_path)
+    write_json(index_path, {**index, "fields": ["other"]})
+    assert load_hashes(docs, "genres") is None
+
+    write_json(index_path, {**index, "format": "old"})
+    assert load_hashes(docs, "genres") is None
+
+
+def test_update_records_applies_changes_and_reports_diff():
+    old, _ = add_hashes([{"_id": "a", "name": "x", "description": "old"},
+                         {"_id": "b", "name": "y", "description": "same"}], "genres")
+    new, _ = add_hashes([{"name": "x", "description": "new"},
+                         {"name": "y", "description": "same"}], "genres")
+
+    updated, diff = update_records(old, {doc["hash"]: doc for doc in new})
+
+    assert [doc["_id"] for doc in updated] == ["a", "b"]
+    assert updated[0]["description"] == "new"
+    assert updated[0]["content_hash"] == new[0]["content_hash"]
+    assert diff["updated"][0]["changes"] == {"description": {"from": "old", "to": "new"}}
+    assert [doc["_id"] for doc in diff["unchanged"]] == ["b"]
+
+
+def test_cleanup_assigns_missing_ids_and_strips_hashes():
+    docs = cleanup([{"_id": "a", "hash": 1, "content_hash": 2}, {"name": "new", "hash": 3}])
+
+    assert docs[0] == {"_id": "a"}
+    assert list(docs[1]) == ["_id", "name"]
+    assert len(docs[1]["_id"]) == 24
+
+
+def test_sync_sheet_adds_updates_and_removes_records(data_dirs, monkeypatch):
+    output_path = data_dirs / "genres.json"
+    write_json(output_path, [
+        {"_id": "a", "name": "Kept", "description": "old"},
+        {"_id": "b", "name": "Removed", "description": ""},
+    ])
+    sheet = [
+        {"name": "Kept", "description": "new"},
+        {"name": "Added", "description": ""},
+    ]
+    monkeypatch.setattr(sync_gsheet, "fetch_sheet_records",
+                        lambda spreadsheet, names: {"genres": [dict(row) for row in sheet]})
+
+    sync_sheet(object(), ["genres"])
+    records = read_json(output_path)
+
+    assert [r["name"] for r in records] == ["Kept", "Added"]
+    assert records[0] == {"_id": "a", "name": "Kept", "description": "new"}
+    assert "hash" not in records[1] and "content_hash" not in records[1]
+
+    # A second sync of the same sheet reuses the stored hash index and changes nothing
+    sync_sheet(object(), ["genres"])
+    assert read_json(output_path) == records
@@ -0,0 +1,59 @@
+"""Tests for src.db.utils.transforms"""
+
+# Imports
+import pytest
+from src.db.utils import transforms
+from src.db.utils.files import read_json, write_json
+from src.db.utils.transforms import add_timestamp, content_hash, transform_collection
+
+
+@pytest.fixture
+def data_dirs(tmp_path, monkeypatch):
+    """Point the raw and transformed collections at temp directories."""
+    raw_dir, transformed_dir = tmp_path / "raw", tmp_path / "transformed"
+    raw_dir.mkdir()
+    transformed_dir.mkdir()
+    monkeypatch.setattr(transforms, "RAW_COLLECTIONS_DIR", raw_dir)
+    monkeypatch.setattr(transforms, "TRANSFORMED_COLLECTIONS_DIR", transformed_dir)
+    return raw_dir, transformed_dir
+
+
+def rename(doc):
+    return {"_id": doc["_id"], "name": doc["title"], "bio": ""}
+
+
+def test_content_hash_ignores_key_order():
+    assert content_hash({"a": 1, "b": 2}) == content_hash({"b": 2, "a": 1})
+
+
+def test_content_hash_excludes_given_fields():
+    doc = {"_id": "a", "name": "x", "date_added": "2024-01-05 09:05"}
+    later = {**doc, "date_added": "2025-01-05 09:05"}
+    assert content_hash(doc, ("date_added",)) == content_hash(later, ("date_added",))
+    assert content_hash(doc) != content_hash(later)
+
+
+def test_transform_collection_stamps_run_stamped_fields(data_dirs):
+    raw_dir, transformed_dir = data_dirs
+    write_json(raw_dir / "creators.json", [{"_id": "a", "title": "Ann"}])
+    write_json(raw_dir / "formats.json", [{"_id": "b", "title": "Paperback"}])
+
+    transform_collection("creators", rename)
+    transform_collection("formats", rename)
+
+    # Empty fields are cleaned; only registered collections get the run stamp
+    assert read_json(transformed_dir / "creators.json") == [
+        {"_id": "a", "name": "Ann", "date_added": transforms.run_timestamp}
+    ]
+    assert read_json(transformed_dir / "formats.json") == [{"_id": "b", "name": "Paperback"}]
+
+
+def test_add_timestamp_stamps_run_stamped_fields(data_dirs):
+    _, transformed_dir = data_dirs
+    write_json(transformed_dir / "genres.json", [{"_id": "a"}])
+
+    add_timestamp("genres")
+
+    assert read_json(transformed_dir / "genres.json") == [
+        {"_id": "a", "date_added": transforms.run_timestamp}
+    ]